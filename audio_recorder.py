@@ -8,20 +8,87 @@ FFmpeg process control, and audio format configuration.
 import os
 import time
 import subprocess
+import shutil
 import pyaudio
 import numpy as np
 from PyQt6 import QtWidgets
 import datetime
-from utils import calculate_file_hash, create_recording_log, update_recording_log, APP_VERSION
+from concurrent.futures import ThreadPoolExecutor
+from utils import probe_ffmpeg_encoders, calculate_file_hash, create_recording_log, update_recording_log, APP_VERSION
+
+class SampleRing:
+    """
+    Fixed-size ring of int16 samples shared between the audio callback and the UI.
+    
+    The audio callback is the only writer and the UI only takes snapshots of the
+    most recent samples, so no lock is needed: the write counter is advanced
+    after the samples are copied in, and readers never look past it.
+    """
+    
+    def __init__(self, size):
+        # Round up to a power of two so positions wrap with a bit mask
+        self.size = 1 << (int(size) - 1).bit_length()
+        self.mask = self.size - 1
+        self.buffer = np.zeros(self.size, dtype=np.int16)
+        self.written = 0  # Total samples written since the last reset
+    
+    def reset(self):
+        """Forget all samples written so far"""
+        self.written = 0
+    
+    def write(self, samples):
+        """Append samples (int16 array), overwriting the oldest ones"""
+        count = samples.size
+        skip = max(0, count - self.size)  # Only the newest samples fit
+        if skip:
+            samples = samples[skip:]
+        start = (self.written + skip) & self.mask
+        end = start + samples.size
+        if end <= self.size:
+            self.buffer[start:end] = samples
+        else:
+            first = self.size - start
+            self.buffer[start:] = samples[:first]
+            self.buffer[:end - self.size] = samples[first:]
+        # Publish the new samples only once they are in the buffer
+        self.written += count
+    
+    def latest(self, count, out=None):
+        """
+        Return a copy of the most recent samples (at most count)
+        
+        If out is given the samples are copied into its beginning and the
+        filled part of out is returned, so no new array is allocated.
+        """
+        written = self.written
+        count = min(count, written, self.size)
+        if out is None:
+            out = np.empty(count, dtype=self.buffer.dtype)
+        else:
+            count = min(count, out.size)
+        start = (written - count) & self.mask
+        end = start + count
+        if end <= self.size:
+            out[:count] = self.buffer[start:end]
+        else:
+            first = self.size - start
+            out[:first] = self.buffer[start:]
+            out[first:count] = self.buffer[:end - self.size]
+        return out[:count]
 
 class AudioRecorder:
+    # Samples kept in memory for the live visualization (~1.4 s at 48 kHz).
+    # The full recording is streamed to FFmpeg, so older samples are dropped.
+    VIZ_RING_SAMPLES = 1 << 16
+    
     def __init__(self, parent):
         self.parent = parent
         self.audio = pyaudio.PyAudio()
         self.stream = None
         self.ffmpeg_process = None
         self.ffmpeg_process2 = None  # Second FFmpeg process for dual recording
-        self.frames = []
+        self.viz_ring = SampleRing(self.VIZ_RING_SAMPLES)
+        self.last_peak = 0  # Absolute peak of the most recent audio chunk
         self.fs = 48000  # Sample rate
         self.channels = 1  # Mono recording
         self.chunk = 2048  # Buffer size
@@ -35,6 +102,16 @@ class AudioRecorder:
         self.ffmpeg_command = None
         self.ffmpeg_command2 = None  # Second FFmpeg command for dual recording
         self.dual_format_enabled = False  # Flag for dual format recording
+        self.ffmpeg_encoders = frozenset()  # Encoder names supported by FFmpeg (empty until probed)
+        self._logged_write_error1 = False  # Pipe write errors are only reported once
+        self._logged_write_error2 = False
+        # Log files (and the hashes they record) are written on this worker, in
+        # submission order, so disk IO never blocks the UI thread
+        self.log_executor = ThreadPoolExecutor(max_workers=1)
+        # Futures for the fields of the current recording's log(s), as returned
+        # by create_recording_log; update_recording_log re-renders from them
+        self.log_fields = None
+        self.log_fields2 = None
         
     def start_recording(self, device_index, output_dir, format_sel, codec_sel, bitrate_sel, sample_rate, 
                         format_sel2=None, codec_sel2=None, bitrate_sel2=None):
@@ -44,12 +121,11 @@ class AudioRecorder:
             self.dual_format_enabled = format_sel2 is not None and codec_sel2 is not None
             
             # Reset error flags
-            if hasattr(self, '_logged_write_error'):
-                delattr(self, '_logged_write_error')
+            self._logged_write_error1 = False
+            self._logged_write_error2 = False
             
             # Create output directory if it doesn't exist
-            if not os.path.exists(output_dir):
-                os.makedirs(output_dir)
+            os.makedirs(output_dir, exist_ok=True)
                 
             # Generate filename based on timestamp
             timestamp = time.strftime("%Y%m%d-%H%M%S")
@@ -74,100 +150,91 @@ class AudioRecorder:
                 self.log_file2 = os.path.join(output_dir, f"{self.current_filename}_2_log")
             
             # Prepare for recording
-            self.frames.clear()
+            self.viz_ring.reset()
+            self.last_peak = 0
             self.fs = int(sample_rate)
             
             # Store start datetime
             self.recording_start_datetime = datetime.datetime.now()
             
-            # Verify FFmpeg
-            try:
-                # Test to make sure FFmpeg is available
-                subprocess.run(['ffmpeg', '-version'], 
-                               stdout=subprocess.PIPE, 
-                               stderr=subprocess.PIPE, 
-                               check=True,
-                               timeout=2)
-            except (subprocess.SubprocessError, FileNotFoundError):
+            # Verify FFmpeg (a PATH lookup, no process needed)
+            if shutil.which('ffmpeg') is None:
                 QtWidgets.QMessageBox.critical(self.parent, "Error", 
                     "FFmpeg not found. Make sure FFmpeg is installed and available in your PATH.")
                 return False
                 
-            # Verify the selected codec is supported
+            # Verify the selected codec is supported, using the encoder list probed
+            # once per session (at startup, or here if that probe found nothing)
+            if not self.ffmpeg_encoders:
+                self.ffmpeg_encoders = probe_ffmpeg_encoders()
+            codec_output = self.ffmpeg_encoders
             try:
-                codec_check = subprocess.run(
-                    ['ffmpeg', '-encoders'],
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE,
-                    check=True,
-                    timeout=2
-                )
-                codec_output = codec_check.stdout.decode('utf-8')
+                # Skip the checks if FFmpeg couldn't be queried
+                if codec_output:
+                    # Special handling for alaw and mulaw
+                    codec_to_check = codec
+                    if codec == "alaw":
+                        codec_to_check = "pcm_alaw"
+                    elif codec == "mulaw":
+                        codec_to_check = "pcm_mulaw"
                 
-                # Special handling for alaw and mulaw
-                codec_to_check = codec
-                if codec == "alaw":
-                    codec_to_check = "pcm_alaw"
-                elif codec == "mulaw":
-                    codec_to_check = "pcm_mulaw"
-                
-                # Map of alternative codecs if primary isn't supported
-                codec_alternatives = {
-                    "libmp3lame": "mp3",
-                    "libvorbis": "vorbis",
-                    "libopus": "opus",
-                    "aac": "aac"  # AAC may be available under a different name
-                }
+                    # Map of alternative codecs if primary isn't supported
+                    codec_alternatives = {
+                        "libmp3lame": "mp3",
+                        "libvorbis": "vorbis",
+                        "libopus": "opus",
+                        "aac": "aac"  # AAC may be available under a different name
+                    }
                 
-                if codec_to_check not in codec_output:
-                    # Check if there's an alternative
-                    alternative = codec_alternatives.get(codec_to_check)
-                    if alternative and alternative in codec_output:
-                        if codec != "alaw" and codec != "mulaw":  # Don't replace alaw/mulaw
-                            codec_sel.setCurrentText(alternative)
-                            codec = alternative
-                            QtWidgets.QMessageBox.information(self.parent, "Information", 
-                                f"Using alternative codec '{alternative}' compatible with your FFmpeg version.")
-                    else:
-                        if codec == "alaw" or codec == "mulaw":
-                            warning_msg = (f"The codec '{codec}' (ffmpeg_codec='{codec_to_check}') might not be "
-                                        f"supported by your FFmpeg version.\n\n"
-                                        f"If you want to use A-law or μ-law, you might need to install a "
-                                        f"more complete version of FFmpeg with support for these codecs.\n\n"
-                                        f"Do you want to continue anyway?")
+                    if codec_to_check not in codec_output:
+                        # Check if there's an alternative
+                        alternative = codec_alternatives.get(codec_to_check)
+                        if alternative and alternative in codec_output:
+                            if codec != "alaw" and codec != "mulaw":  # Don't replace alaw/mulaw
+                                codec_sel.setCurrentText(alternative)
+                                codec = alternative
+                                QtWidgets.QMessageBox.information(self.parent, "Information", 
+                                    f"Using alternative codec '{alternative}' compatible with your FFmpeg version.")
+                        else:
+                            if codec == "alaw" or codec == "mulaw":
+                                warning_msg = (f"The codec '{codec}' (ffmpeg_codec='{codec_to_check}') might not be "
+                                            f"supported by your FFmpeg version.\n\n"
+                                            f"If you want to use A-law or μ-law, you might need to install a "
+                                            f"more complete version of FFmpeg with support for these codecs.\n\n"
+                                            f"Do you want to continue anyway?")
                             
-                            reply = QtWidgets.QMessageBox.question(self.parent, "Warning", warning_msg, 
-                                                                QtWidgets.QMessageBox.StandardButton.Yes | 
-                                                                QtWidgets.QMessageBox.StandardButton.No)
+                                reply = QtWidgets.QMessageBox.question(self.parent, "Warning", warning_msg, 
+                                                                    QtWidgets.QMessageBox.StandardButton.Yes | 
+                                                                    QtWidgets.QMessageBox.StandardButton.No)
                             
-                            if reply == QtWidgets.QMessageBox.StandardButton.No:
-                                codec_sel.setCurrentText("pcm_s16le (16-bit)")
-                                codec = "pcm_s16le"
-                        else:
-                            QtWidgets.QMessageBox.warning(self.parent, "Warning", 
-                                f"The codec '{codec}' might not be supported by your FFmpeg version.\n"
-                                "If recording fails, try installing a more complete version of FFmpeg.")
+                                if reply == QtWidgets.QMessageBox.StandardButton.No:
+                                    codec_sel.setCurrentText("pcm_s16le (16-bit)")
+                                    codec = "pcm_s16le"
+                            else:
+                                QtWidgets.QMessageBox.warning(self.parent, "Warning", 
+                                    f"The codec '{codec}' might not be supported by your FFmpeg version.\n"
+                                    "If recording fails, try installing a more complete version of FFmpeg.")
                 
-                # Also check the second codec if dual recording is enabled
-                if self.dual_format_enabled:
-                    codec_to_check2 = codec2
-                    if codec2 == "alaw":
-                        codec_to_check2 = "pcm_alaw"
-                    elif codec2 == "mulaw":
-                        codec_to_check2 = "pcm_mulaw"
+                    # Also check the second codec if dual recording is enabled
+                    if self.dual_format_enabled:
+                        codec_to_check2 = codec2
+                        if codec2 == "alaw":
+                            codec_to_check2 = "pcm_alaw"
+                        elif codec2 == "mulaw":
+                            codec_to_check2 = "pcm_mulaw"
                     
-                    if codec_to_check2 not in codec_output:
-                        alternative2 = codec_alternatives.get(codec_to_check2)
-                        if alternative2 and alternative2 in codec_output:
-                            if codec2 != "alaw" and codec2 != "mulaw":
-                                codec_sel2.setCurrentText(alternative2)
-                                codec2 = alternative2
-                                QtWidgets.QMessageBox.information(self.parent, "Information", 
-                                    f"Using alternative codec '{alternative2}' for second format.")
-                        else:
-                            QtWidgets.QMessageBox.warning(self.parent, "Warning", 
-                                f"The codec '{codec2}' for the second format might not be supported.\n"
-                                "If recording fails, try a different second format.")
+                        if codec_to_check2 not in codec_output:
+                            alternative2 = codec_alternatives.get(codec_to_check2)
+                            if alternative2 and alternative2 in codec_output:
+                                if codec2 != "alaw" and codec2 != "mulaw":
+                                    codec_sel2.setCurrentText(alternative2)
+                                    codec2 = alternative2
+                                    QtWidgets.QMessageBox.information(self.parent, "Information", 
+                                        f"Using alternative codec '{alternative2}' for second format.")
+                            else:
+                                QtWidgets.QMessageBox.warning(self.parent, "Warning", 
+                                    f"The codec '{codec2}' for the second format might not be supported.\n"
+                                    "If recording fails, try a different second format.")
                                 
             except Exception:
                 # If we can't verify, continue anyway
@@ -269,7 +336,8 @@ class AudioRecorder:
                                            stream_callback=self.audio_callback)
 
                 # Create initial log file
-                create_recording_log(
+                self.log_fields = self._submit_log_task(
+                    create_recording_log,
                     self.log_file,
                     self.output_file,
                     command,
@@ -277,8 +345,10 @@ class AudioRecorder:
                 )
                 
                 # Create second log file if dual recording is enabled
+                self.log_fields2 = None
                 if self.dual_format_enabled:
-                    create_recording_log(
+                    self.log_fields2 = self._submit_log_task(
+                        create_recording_log,
                         self.log_file2,
                         self.output_file2,
                         command2,
@@ -308,7 +378,6 @@ class AudioRecorder:
     
     def audio_callback(self, in_data, frame_count, time_info, status):
         """Audio stream callback that writes data to FFmpeg process(es)"""
-        self.frames.append(in_data)
         try:
             # Write to the first FFmpeg process
             if self.ffmpeg_process and self.ffmpeg_process.poll() is None:
@@ -319,7 +388,7 @@ class AudioRecorder:
                     pass
                 except Exception as e:
                     # Log other errors but only once
-                    if not hasattr(self, '_logged_write_error1'):
+                    if not self._logged_write_error1:
                         self._logged_write_error1 = True
                         self.parent.statusBar().showMessage(f"Write error (1): {str(e)}")
             
@@ -332,14 +401,52 @@ class AudioRecorder:
                     pass
                 except Exception as e:
                     # Log other errors but only once
-                    if not hasattr(self, '_logged_write_error2'):
+                    if not self._logged_write_error2:
                         self._logged_write_error2 = True
                         self.parent.statusBar().showMessage(f"Write error (2): {str(e)}")
-                        
+            
+            # Feed the live visualization after the audio has been handed to FFmpeg
+            samples = np.frombuffer(in_data, dtype=np.int16)
+            if samples.size:
+                self.viz_ring.write(samples)
+                # Peak from the extremes: no abs() array, and Python ints avoid the
+                # int16 overflow of abs(-32768)
+                self.last_peak = max(int(samples.max()), -int(samples.min()))
+                
         except Exception:
             pass
         return (in_data, pyaudio.paContinue)
     
+    def _submit_log_task(self, fn, *args):
+        """Run fn(*args) on log_executor, printing any exception it raises"""
+        future = self.log_executor.submit(fn, *args)
+        future.add_done_callback(self._report_log_task_error)
+        return future
+    
+    @staticmethod
+    def _report_log_task_error(future):
+        """Done-callback for log tasks: errors would otherwise stay in the future"""
+        if not future.cancelled() and future.exception() is not None:
+            print(f"Error writing recording log: {future.exception()}")
+    
+    def _finalize_logs(self, end_time, output_file, log_file, log_fields, output_file2, log_file2, log_fields2):
+        """Hash the finished recording(s) and complete their logs (runs on log_executor)"""
+        # hashlib releases the GIL, so in dual mode the second file is
+        # hashed on a worker thread while the first is hashed here.
+        # The log fields are futures queued earlier on this same single-worker
+        # executor, so their result() calls do not block.
+        with ThreadPoolExecutor(max_workers=1) as hash_executor:
+            if output_file2 and log_fields2:
+                file_hash2_future = hash_executor.submit(calculate_file_hash, output_file2)
+            
+            if output_file and log_fields:
+                # Calculate file hash and update log file
+                update_recording_log(log_file, log_fields.result(), end_time, calculate_file_hash(output_file))
+            
+            if output_file2 and log_fields2:
+                # Update second log file
+                update_recording_log(log_file2, log_fields2.result(), end_time, file_hash2_future.result())
+    
     def stop_recording(self):
         """Stop recording and finalize the output file(s)"""
         try:
@@ -446,27 +553,19 @@ class AudioRecorder:
                 second_file_success = os.path.exists(self.output_file2) and os.path.getsize(self.output_file2) > 0
             
             # Update logs and calculate hashes for successful recordings
-            if first_file_success:
-                # Calculate file hash
-                file_hash = calculate_file_hash(self.output_file)
-                
-                # Update log file
-                update_recording_log(
-                    self.log_file, 
-                    recording_end_datetime,
-                    file_hash
-                )
-            
-            if self.dual_format_enabled and second_file_success:
-                # Calculate file hash for second file
-                file_hash2 = calculate_file_hash(self.output_file2)
-                
-                # Update second log file
-                update_recording_log(
-                    self.log_file2, 
-                    recording_end_datetime,
-                    file_hash2
-                )
+            self._submit_log_task(
+                self._finalize_logs,
+                recording_end_datetime,
+                self.output_file if first_file_success else None,
+                self.log_file,
+                self.log_fields,
+                self.output_file2 if second_file_success else None,
+                self.log_file2,
+                self.log_fields2
+            )
+            # The fields of failed recordings are simply dropped here
+            self.log_fields = None
+            self.log_fields2 = None
             
             # Return success based on first file (primary file)
             if first_file_success:
@@ -474,7 +573,7 @@ class AudioRecorder:
             else:
                 # First file failed - show error message
                 err_output = ""
-                if hasattr(self, 'ffmpeg_process') and self.ffmpeg_process and hasattr(self.ffmpeg_process, 'stderr'):
+                if self.ffmpeg_process and self.ffmpeg_process.stderr:
                     try:
                         err_output = self.ffmpeg_process.stderr.read().decode('utf-8', errors='ignore')
                     except:
@@ -535,4 +634,6 @@ class AudioRecorder:
             except:
                 pass
                 
+        # Queued log writes still finish; the interpreter waits for them on exit
+        self.log_executor.shutdown(wait=False)
         self.audio.terminate()
\ No newline at end of file
@@ -11,26 +11,32 @@ from PyQt6.QtCore import QThread, pyqtSignal
 class FileMonitorThread(QThread):
     """
     Thread for monitoring file size and status during recording.
-    Emits signals with the current recording status and file size.
+    Emits signals with the current recording status and file sizes.
     """
-    file_status = pyqtSignal(bool, int)  # (is_recording, file_size_kb)
+    file_status = pyqtSignal(bool, int, int)  # (is_recording, file_size_kb, file2_size_kb)
     
-    def __init__(self, filename):
+    def __init__(self, filename, filename2=None):
         super().__init__()
         self.filename = filename
+        self.filename2 = filename2  # Second format file (dual recording), if any
         self.is_running = True
     
     def run(self):
         """Main thread loop to monitor file size and status"""
         while self.is_running:
+            # A single stat call; a missing file raises OSError
             try:
-                if os.path.exists(self.filename):
-                    size_kb = os.path.getsize(self.filename) / 1024
-                    self.file_status.emit(True, int(size_kb))
-                else:
-                    self.file_status.emit(False, 0)
+                size_kb = os.stat(self.filename).st_size >> 10
             except Exception:
-                self.file_status.emit(False, 0)
+                self.file_status.emit(False, 0, 0)
+            else:
+                size2_kb = 0
+                if self.filename2:
+                    try:
+                        size2_kb = os.stat(self.filename2).st_size >> 10
+                    except OSError:
+                        pass
+                self.file_status.emit(True, size_kb, size2_kb)
             
             # Check every 200ms
             time.sleep(0.2)
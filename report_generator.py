@@ -6,51 +6,81 @@ spectrograms, and audio file metadata.
 """
 
 import os
+import tempfile
+import threading
 import subprocess
 import numpy as np
-import librosa
-import librosa.display
-import matplotlib
-# Use Agg backend to avoid GUI issues in threads
-matplotlib.use('Agg')
-import matplotlib.pyplot as plt
-from matplotlib.ticker import FuncFormatter
 from PyQt6.QtCore import QThread, pyqtSignal
 from fpdf import FPDF
 import time
 import warnings
 from datetime import timedelta
 import sys
-import hashlib
-from utils import APP_VERSION
+from utils import hash_file, format_file_size, APP_VERSION
 
 # Filter librosa warnings
 warnings.filterwarnings("ignore", category=FutureWarning)
 warnings.filterwarnings("ignore", message="PySoundFile failed")
 warnings.filterwarnings("ignore", message="amplitude_to_db was called on complex input")
 
+# Serializes _ensure_matplotlib_config_dir between parallel report threads
+_mpl_config_lock = threading.Lock()
+
+def _matplotlib_dirs_writable():
+    """Whether the config and cache directories matplotlib would use are writable"""
+    home = os.path.expanduser('~')
+    if sys.platform.startswith(('linux', 'freebsd')):
+        mpl_dirs = [
+            os.path.join(os.environ.get('XDG_CONFIG_HOME') or os.path.join(home, '.config'), 'matplotlib'),
+            os.path.join(os.environ.get('XDG_CACHE_HOME') or os.path.join(home, '.cache'), 'matplotlib'),
+        ]
+    else:
+        mpl_dirs = [os.path.join(home, '.matplotlib')]
+        
+    for mpl_dir in mpl_dirs:
+        # matplotlib creates missing directories itself, so try the same
+        try:
+            os.makedirs(mpl_dir, exist_ok=True)
+        except OSError:
+            pass
+        if not os.access(mpl_dir, os.W_OK):
+            return False
+    return True
+
+def _ensure_matplotlib_config_dir():
+    """
+    Give matplotlib a stable config/cache directory when its own is not writable
+    
+    Without one (Flatpak, AppImage, CI) matplotlib builds a throwaway font
+    cache in a fresh temporary directory on every run. Must run before
+    matplotlib is first imported (also via librosa.display).
+    
+    Called from ReportGeneratorThread.run, so it sets os.environ from a worker
+    thread; the lock keeps parallel reports from racing on the check and the
+    update.
+    """
+    with _mpl_config_lock:
+        if 'MPLCONFIGDIR' in os.environ or _matplotlib_dirs_writable():
+            return
+        os.environ['MPLCONFIGDIR'] = os.path.join(tempfile.gettempdir(), 'kvsrecorder_mpl')
+        os.makedirs(os.environ['MPLCONFIGDIR'], exist_ok=True)
+
 class ReportGeneratorThread(QThread):
     # Signals to communicate with main interface
     report_progress = pyqtSignal(str)
     report_finished = pyqtSignal(bool, str)
     
-    def __init__(self, output_file, format_sel, codec_sel, bitrate_sel, temp_dir):
+    def __init__(self, output_file, codec, bitrate, temp_dir):
         super().__init__()
         self.output_file = output_file
-        self.format_sel = format_sel
-        self.codec_sel = codec_sel
-        self.bitrate_sel = bitrate_sel
+        self.codec = codec  # Codec menu text, e.g. "pcm_s16le (16-bit)"
+        self.bitrate = bitrate  # Bitrate menu text, or None if not selectable
         self.temp_dir = temp_dir
         self.channels = 1  # Default to mono
         
     def calculate_file_hash(self, file_path):
         """Calculate SHA-256 hash of the audio file"""
-        hash_obj = hashlib.sha256()
-        with open(file_path, 'rb') as f:
-            # Read file in chunks of 4K
-            for chunk in iter(lambda: f.read(4096), b''):
-                hash_obj.update(chunk)
-        return hash_obj.hexdigest()
+        return hash_file(file_path)
         
     def format_time_axis(self, duration):
         """Format time axis labels based on total duration"""
@@ -68,6 +98,17 @@ class ReportGeneratorThread(QThread):
         try:
             self.report_progress.emit("Starting report generation...")
             
+            # librosa and matplotlib take long to import, so they are only
+            # loaded when the first report is generated instead of at startup
+            _ensure_matplotlib_config_dir()
+            import librosa
+            import librosa.display
+            import matplotlib
+            # Use Agg backend to avoid GUI issues in threads
+            matplotlib.use('Agg')
+            from matplotlib.figure import Figure
+            from matplotlib import gridspec
+            
             # Verify file exists and is not empty
             if not os.path.exists(self.output_file) or os.path.getsize(self.output_file) == 0:
                 self.report_finished.emit(False, f"Invalid or empty file: {self.output_file}")
@@ -77,10 +118,11 @@ class ReportGeneratorThread(QThread):
             pdf_path = os.path.splitext(self.output_file)[0] + "_report.pdf"
             
             # Make sure temp directory exists
-            if not os.path.exists(self.temp_dir):
-                os.makedirs(self.temp_dir)
+            os.makedirs(self.temp_dir, exist_ok=True)
                 
-            viz_path = os.path.join(self.temp_dir, 'audio_visualization.png')
+            # One visualization file per report, so parallel reports don't overwrite each other
+            viz_name = os.path.splitext(os.path.basename(self.output_file))[0] + '_visualization.png'
+            viz_path = os.path.join(self.temp_dir, viz_name)
             
             # Setup warnings to handle deprecation notices
             warnings.filterwarnings("ignore", category=FutureWarning)
@@ -93,13 +135,7 @@ class ReportGeneratorThread(QThread):
             # Get file size information
             file_size_str = "N/A"
             if os.path.exists(self.output_file):
-                file_size_bytes = os.path.getsize(self.output_file)
-                if file_size_bytes < 1024:
-                    file_size_str = f"{file_size_bytes} B"
-                elif file_size_bytes < 1024 * 1024:
-                    file_size_str = f"{file_size_bytes / 1024:.2f} KB"
-                else:
-                    file_size_str = f"{file_size_bytes / (1024 * 1024):.2f} MB"
+                file_size_str = format_file_size(os.path.getsize(self.output_file))
             
             # Load audio - process the full file regardless of size
             self.report_progress.emit("Loading audio for analysis...")
@@ -142,17 +178,17 @@ class ReportGeneratorThread(QThread):
             self.report_progress.emit("Generating visualizations...")
             
             # Create a figure with specific subplot grid
-            fig = plt.figure(figsize=(10, 7), dpi=150)
+            # (a standalone Figure, since pyplot's global state is not thread-safe)
+            fig = Figure(figsize=(10, 7), dpi=150)
             
             # Main title for the visualization
             #fig.suptitle("Audio Visualization", fontsize=16, fontweight='bold', color='#1a73e8')
             
             # Create a GridSpec layout with 2 rows and 1 column
-            from matplotlib import gridspec
-            gs = gridspec.GridSpec(2, 1, height_ratios=[1, 1], hspace=0.5)
+            gs = gridspec.GridSpec(2, 1, figure=fig, height_ratios=[1, 1], hspace=0.5)
             
             # Create waveform plot in the first row
-            ax1 = plt.subplot(gs[0])
+            ax1 = fig.add_subplot(gs[0])
             librosa.display.waveshow(audio, sr=sr, ax=ax1, color='#4CAF50')
             ax1.set_title("Waveform", color='#1a73e8', fontweight='bold')
             ax1.set_xlabel(time_label, color='#1a73e8')
@@ -161,7 +197,7 @@ class ReportGeneratorThread(QThread):
             ax1.grid(True, color='#e8f0fe', linestyle='-', linewidth=0.5)
             
             # Create spectrogram plot in the second row
-            ax2 = plt.subplot(gs[1])
+            ax2 = fig.add_subplot(gs[1])
             S = librosa.stft(audio)
             spec_img = librosa.display.specshow(
                 librosa.amplitude_to_db(np.abs(S), ref=np.max),
@@ -190,9 +226,8 @@ class ReportGeneratorThread(QThread):
             pos_wave = ax1.get_position()
             ax1.set_position([pos_wave.x0, pos_wave.y0, pos_spectro.width, pos_wave.height])
             
-            plt.tight_layout(rect=[0, 0, 1, 0.95])  # Adjust for suptitle
-            plt.savefig(viz_path, bbox_inches='tight', facecolor='white')
-            plt.close('all')
+            fig.tight_layout(rect=[0, 0, 1, 0.95])  # Adjust for suptitle
+            fig.savefig(viz_path, bbox_inches='tight', facecolor='white')
 
             # Calculate audio statistics
             self.report_progress.emit("Calculating audio statistics...")
@@ -207,8 +242,8 @@ class ReportGeneratorThread(QThread):
             milliseconds = int((duration - int(duration)) * 1000)
             duration_formatted = f"{hours:02d}:{minutes:02d}:{seconds:02d}.{milliseconds:03d}"
             
-            # Get bitdepth information - FIX: Extract codec properly from the combo box
-            codec_full = self.codec_sel.currentText()
+            # Get bitdepth information - FIX: Extract codec properly from the codec menu text
+            codec_full = self.codec
             codec_base = codec_full.split(" ")[0]  # Extract just the codec name without description
             
             # Set bitdepth based on codec
@@ -240,8 +275,8 @@ class ReportGeneratorThread(QThread):
                     
             # Get bitrate information - handle for all formats
             bitrate_str = "N/A"
-            if self.bitrate_sel and self.bitrate_sel.isEnabled():
-                bitrate_str = self.bitrate_sel.currentText()
+            if self.bitrate:
+                bitrate_str = self.bitrate
             
             # Some formats have implicit bitrates even when not shown in UI
             fmt = os.path.splitext(self.output_file)[1][1:].lower()
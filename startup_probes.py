@@ -0,0 +1,59 @@
+"""
+Startup Probes Module
+
+Runs slow system queries (audio device enumeration, FFmpeg encoder list)
+on the thread pool so they don't delay the first paint of the window.
+"""
+
+import pyaudio
+from PyQt6.QtCore import QObject, QRunnable, pyqtSignal
+from utils import probe_ffmpeg_encoders
+
+class ProbeSignals(QObject):
+    """
+    Signals for the probe tasks (a QRunnable cannot emit signals itself).
+    Results are delivered to the GUI thread through queued connections.
+    """
+    devices_ready = pyqtSignal(list)  # [(name, device_index), ...]
+    encoders_ready = pyqtSignal(object)  # frozenset of encoder names
+
+class DeviceEnumTask(QRunnable):
+    """
+    Task for listing the audio input devices known to PyAudio.
+    
+    Uses its own PyAudio instance: PortAudio is not thread-safe, and the
+    recorder's instance may be opening a stream or being terminated on the
+    GUI thread meanwhile.
+    """
+    def __init__(self, signals):
+        super().__init__()
+        self.signals = signals
+
+    def run(self):
+        """Collect (name, index) of every device with input channels"""
+        devices = []
+        audio = None
+        try:
+            audio = pyaudio.PyAudio()
+            for i in range(audio.get_device_count()):
+                device_info = audio.get_device_info_by_index(i)
+                if device_info["maxInputChannels"] > 0:
+                    devices.append((device_info["name"], i))
+        except Exception as e:
+            print(f"Error listing input devices: {e}")
+        finally:
+            if audio is not None:
+                audio.terminate()
+        self.signals.devices_ready.emit(devices)
+
+class EncoderProbeTask(QRunnable):
+    """
+    Task for querying the encoders supported by FFmpeg.
+    """
+    def __init__(self, signals):
+        super().__init__()
+        self.signals = signals
+
+    def run(self):
+        """Probe FFmpeg and emit the encoder names"""
+        self.signals.encoders_ready.emit(probe_ffmpeg_encoders())
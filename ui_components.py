@@ -6,13 +6,11 @@ Contains the main application UI class and related components.
 
 import os
 import time
-import shutil
+import threading
+from functools import partial
 import numpy as np
-import matplotlib.pyplot as plt
 from datetime import timedelta
-import pyaudio
 import warnings
-import subprocess
 
 from PyQt6 import QtWidgets, QtCore, QtGui
 from PyQt6.QtGui import QAction
@@ -21,14 +19,176 @@ from PyQt6.QtCore import QTimer
 from audio_recorder import AudioRecorder
 from report_generator import ReportGeneratorThread
 from file_monitor import FileMonitorThread
-from utils import create_temp_directory, clean_temp_directory, open_directory, format_time, APP_VERSION
+from waveform_renderer import WaveformRenderSignals, WaveformBuffers, WaveformRenderTask
+from startup_probes import ProbeSignals, DeviceEnumTask, EncoderProbeTask
+from utils import get_temp_directory_path, create_temp_directory, clean_temp_directory, open_directory, prefetch_file, APP_VERSION
 
 # Filter librosa warnings
 warnings.filterwarnings("ignore", category=FutureWarning)
 warnings.filterwarnings("ignore", message="PySoundFile failed")
 warnings.filterwarnings("ignore", message="amplitude_to_db was called on complex input")
 
+# Theme color definitions
+PRIMARY_BLUE = "#1a73e8"       # Primary blue
+LIGHT_BLUE = "#e8f0fe"         # Light blue for backgrounds
+DARK_BLUE = "#174ea6"          # Dark blue for hover
+WHITE = "#ffffff"              # White for general background
+TEXT_COLOR = "#202124"         # Almost black text color
+
+# Codec menu contents per format, in menu order: (codec items, default codec, bitrate enabled)
+CODEC_TABLE = {
+    # Bit depth information is shown for each WAV codec
+    "wav": ([
+        "pcm_s16le (16-bit)", 
+        "pcm_s24le (24-bit)", 
+        "pcm_f32le (32-bit float)", 
+        "alaw (8-bit A-law)", 
+        "mulaw (8-bit μ-law)"
+    ], "pcm_s16le (16-bit)", False),
+    "mp3": (["libmp3lame"], "libmp3lame", True),
+    "ogg": (["libvorbis", "libopus"], "libvorbis", True),
+    "flac": (["flac"], "flac", False),
+    # Only standard AAC - removed HE-AAC options
+    "m4a": (["aac"], "aac", True),
+}
+
+# Application stylesheet, formatted once at import time
+_STYLESHEET = f"""
+    QMainWindow, QWidget {{
+        background-color: {WHITE};
+        color: {TEXT_COLOR};
+    }}
+    
+    QGroupBox {{
+        border: 1px solid #dadce0;
+        border-radius: 8px;
+        margin-top: 1ex;
+        font-weight: bold;
+        background-color: {WHITE};
+    }}
+    
+    QGroupBox::title {{
+        subcontrol-origin: margin;
+        left: 10px;
+        padding: 0 3px 0 3px;
+        color: {PRIMARY_BLUE};
+    }}
+    
+    QPushButton {{
+        background-color: {PRIMARY_BLUE};
+        color: white;
+        border: none;
+        border-radius: 4px;
+        padding: 6px 16px;
+        font-weight: bold;
+    }}
+    
+    QPushButton:hover {{
+        background-color: {DARK_BLUE};
+    }}
+    
+    QPushButton:disabled {{
+        background-color: #dadce0;
+        color: #9aa0a6;
+    }}
+    
+    QPushButton#recordButton {{
+        font-size: 16px;
+        padding: 8px;
+    }}
+    
+    QPushButton#recordButton[recording="true"] {{
+        background-color: #e63946;
+    }}
+    
+    QComboBox {{
+        border: 1px solid #dadce0;
+        border-radius: 4px;
+        padding: 5px;
+        background-color: {WHITE};
+        selection-background-color: {LIGHT_BLUE};
+    }}
+    
+    QComboBox::drop-down {{
+        border: none;
+        width: 20px;
+    }}
+    
+    QProgressBar {{
+        border: 1px solid #dadce0;
+        border-radius: 4px;
+        background-color: {WHITE};
+        text-align: center;
+    }}
+    
+    QProgressBar::chunk {{
+        background-color: {PRIMARY_BLUE};
+        width: 10px;
+    }}
+    
+    QLineEdit {{
+        border: 1px solid #dadce0;
+        border-radius: 4px;
+        padding: 5px;
+        background-color: {WHITE};
+    }}
+    
+    QLabel {{
+        color: {TEXT_COLOR};
+    }}
+    
+    QMenuBar {{
+        background-color: {WHITE};
+        color: {TEXT_COLOR};
+    }}
+    
+    QMenuBar::item:selected {{
+        background-color: {LIGHT_BLUE};
+    }}
+    
+    QMenu {{
+        background-color: {WHITE};
+        color: {TEXT_COLOR};
+        border: 1px solid #dadce0;
+    }}
+    
+    QMenu::item:selected {{
+        background-color: {LIGHT_BLUE};
+    }}
+"""
+
+def _format_size_kb(size_kb):
+    """Format a whole-KB recording size for the file status line"""
+    if size_kb < 1 << 10:
+        return f"{size_kb} KB"
+    return f"{size_kb / 1024:.1f} MB"
+
 class AudioProAdvanced(QtWidgets.QMainWindow):
+    # Theme colors, for widgets styled outside the application stylesheet
+    primary_blue = PRIMARY_BLUE
+    light_blue = LIGHT_BLUE
+    dark_blue = DARK_BLUE
+    white = WHITE
+    text_color = TEXT_COLOR
+    
+    # Maximum number of reports generated at the same time
+    MAX_PARALLEL_REPORTS = 2
+    
+    # Minimum time between two visualization updates (ms). Slightly below the
+    # 50 ms timer interval so normal timer jitter doesn't skip every other tick.
+    VIZ_MIN_INTERVAL_MS = 40
+    
+    # Recording timer interval (ms), and the number of ticks between time
+    # display updates / indicator blinks (10 x 50 ms = twice a second)
+    RECORDING_TICK_MS = 50
+    RECORDING_SLOW_TICKS = 10
+    
+    # File status label styles
+    _STATUS_GREEN = "color: #4CAF50; font-weight: bold;"
+    _STATUS_YELLOW = "color: #FFC107; font-weight: bold;"
+    _STATUS_IDLE = "font-style: italic; color: gray;"
+    _STATUS_BUSY = "color: #1a73e8; font-weight: bold;"
+    
     def __init__(self):
         super().__init__()
         self.setWindowTitle(f"KVSrecorder v{APP_VERSION}")
@@ -39,17 +199,23 @@ class AudioProAdvanced(QtWidgets.QMainWindow):
 
         # Main variables
         self.recorder = AudioRecorder(self)
-        self.stream = None
-        self.ffmpeg_process = None
-        self.frames = []
-        self.recording_start_time = 0
-        self.temp_dir = "temp"
+        self.elapsed_timer = QtCore.QElapsedTimer()  # Monotonic recording clock
+        self.time_display_seconds = None  # Whole seconds currently shown
+        self.temp_dir = get_temp_directory_path()
         self.last_recorded_file = None
         self.last_recorded_file2 = None  # Second format recording
         
         # Create temporary directory
-        if not os.path.exists(self.temp_dir):
-            os.makedirs(self.temp_dir)
+        os.makedirs(self.temp_dir, exist_ok=True)
+        
+        # Slow system queries run on the thread pool and report back through these signals
+        self.probe_signals = ProbeSignals()
+        self.probe_signals.devices_ready.connect(self.fill_input_devices)
+        self.probe_signals.encoders_ready.connect(self.set_ffmpeg_encoders)
+        
+        # Encoders supported by FFmpeg (kept on the recorder, which also needs them),
+        # probed once instead of on every format change
+        QtCore.QThreadPool.globalInstance().start(EncoderProbeTask(self.probe_signals))
             
         # Check for optional packages
         try:
@@ -59,9 +225,9 @@ class AudioProAdvanced(QtWidgets.QMainWindow):
             self.has_soundfile = False
             print("SoundFile not found. Will use audioread to load audio files.")
 
-        # Report generation queue
+        # Report generation queue and the reports currently being generated
         self.report_queue = []
-        self.is_report_processing = False
+        self.report_generators = []
 
         self.setup_ui()
         self.populate_input_devices()
@@ -69,108 +235,8 @@ class AudioProAdvanced(QtWidgets.QMainWindow):
         
     def apply_white_blue_theme(self):
         """Apply the white and blue theme to the application"""
-        # Theme color definitions
-        self.primary_blue = "#1a73e8"       # Primary blue
-        self.light_blue = "#e8f0fe"         # Light blue for backgrounds
-        self.dark_blue = "#174ea6"          # Dark blue for hover
-        self.white = "#ffffff"              # White for general background
-        self.text_color = "#202124"         # Almost black text color
-        
         # Apply style to the entire application
-        self.setStyleSheet(f"""
-            QMainWindow, QWidget {{
-                background-color: {self.white};
-                color: {self.text_color};
-            }}
-            
-            QGroupBox {{
-                border: 1px solid #dadce0;
-                border-radius: 8px;
-                margin-top: 1ex;
-                font-weight: bold;
-                background-color: {self.white};
-            }}
-            
-            QGroupBox::title {{
-                subcontrol-origin: margin;
-                left: 10px;
-                padding: 0 3px 0 3px;
-                color: {self.primary_blue};
-            }}
-            
-            QPushButton {{
-                background-color: {self.primary_blue};
-                color: white;
-                border: none;
-                border-radius: 4px;
-                padding: 6px 16px;
-                font-weight: bold;
-            }}
-            
-            QPushButton:hover {{
-                background-color: {self.dark_blue};
-            }}
-            
-            QPushButton:disabled {{
-                background-color: #dadce0;
-                color: #9aa0a6;
-            }}
-            
-            QComboBox {{
-                border: 1px solid #dadce0;
-                border-radius: 4px;
-                padding: 5px;
-                background-color: {self.white};
-                selection-background-color: {self.light_blue};
-            }}
-            
-            QComboBox::drop-down {{
-                border: none;
-                width: 20px;
-            }}
-            
-            QProgressBar {{
-                border: 1px solid #dadce0;
-                border-radius: 4px;
-                background-color: {self.white};
-                text-align: center;
-            }}
-            
-            QProgressBar::chunk {{
-                background-color: {self.primary_blue};
-                width: 10px;
-            }}
-            
-            QLineEdit {{
-                border: 1px solid #dadce0;
-                border-radius: 4px;
-                padding: 5px;
-                background-color: {self.white};
-            }}
-            
-            QLabel {{
-                color: {self.text_color};
-            }}
-            
-            QMenuBar {{
-                background-color: {self.white};
-                color: {self.text_color};
-            }}
-            
-            QMenuBar::item:selected {{
-                background-color: {self.light_blue};
-            }}
-            
-            QMenu {{
-                background-color: {self.white};
-                color: {self.text_color};
-                border: 1px solid #dadce0;
-            }}
-            
-            QMenu::item:selected {{
-                background-color: {self.light_blue};
-            }}
-        """)
+        self.setStyleSheet(_STYLESHEET)
 
     def setup_menu(self):
         """Setup application menu"""
@@ -224,13 +290,13 @@ class AudioProAdvanced(QtWidgets.QMainWindow):
 
         # Advanced audio settings
         settings_group = QtWidgets.QGroupBox("Audio Settings")
-        settings_group.setMaximumHeight(170)  # Make more compact
+        settings_group.setMaximumHeight(195)  # Make more compact
         form_layout = QtWidgets.QFormLayout(settings_group)
         form_layout.setContentsMargins(8, 12, 8, 8)  # Make UI more compact
         form_layout.setVerticalSpacing(6)  # Reduce vertical spacing
         
         self.format_sel = QtWidgets.QComboBox()
-        self.format_sel.addItems(["wav", "mp3", "ogg", "flac", "m4a"])
+        self.format_sel.addItems(list(CODEC_TABLE))
         self.format_sel.currentIndexChanged.connect(self.update_codec_selection)
         
         self.codec_sel = QtWidgets.QComboBox()
@@ -243,8 +309,14 @@ class AudioProAdvanced(QtWidgets.QMainWindow):
         self.sample_rate_sel.setCurrentText("48000")
         self.sample_rate_sel.currentTextChanged.connect(self.update_sample_rate)
         
+        # Non-modal codec suggestion shown under the codec menu
+        self.codec_tip = QtWidgets.QLabel("Tip: 8 kHz pairs well with A-law or μ-law")
+        self.codec_tip.setStyleSheet(f"color: {self.primary_blue}; font-style: italic;")
+        self.codec_tip.setVisible(False)
+        
         form_layout.addRow("Format:", self.format_sel)
         form_layout.addRow("Codec:", self.codec_sel)
+        form_layout.addRow("", self.codec_tip)
         form_layout.addRow("Bitrate:", self.bitrate_sel)
         form_layout.addRow("Sample Rate:", self.sample_rate_sel)
         
@@ -260,21 +332,24 @@ class AudioProAdvanced(QtWidgets.QMainWindow):
         dual_layout.setVerticalSpacing(6)  # Reduce vertical spacing
         
         self.format_sel2 = QtWidgets.QComboBox()
-        self.format_sel2.addItems(["wav", "mp3", "ogg", "flac", "m4a"])
-        self.format_sel2.currentIndexChanged.connect(self.update_codec_selection2)
+        self.format_sel2.addItems(list(CODEC_TABLE))
         
         self.codec_sel2 = QtWidgets.QComboBox()
         
         self.bitrate_sel2 = QtWidgets.QComboBox()
         self.bitrate_sel2.addItems(["128k", "192k", "256k", "320k"])
         
+        # The second codec menu needs no extra checks, so the table lookup is connected directly
+        self.format_sel2.currentIndexChanged.connect(
+            partial(self._apply_codec_options, self.format_sel2, self.codec_sel2, self.bitrate_sel2)
+        )
+        
         dual_layout.addRow("Second Format:", self.format_sel2)
         dual_layout.addRow("Second Codec:", self.codec_sel2)
         dual_layout.addRow("Second Bitrate:", self.bitrate_sel2)
         
         # Set second format to different default (e.g., if first is wav, second is mp3)
         self.format_sel2.setCurrentText("mp3")
-        self.update_codec_selection2()
         
         layout.addWidget(dual_group)
         
@@ -298,19 +373,25 @@ class AudioProAdvanced(QtWidgets.QMainWindow):
         timer_layout = QtWidgets.QHBoxLayout()
         
         # Timer display
-        self.time_display = QtWidgets.QLabel("00:00:00.000")
+        self.time_display = QtWidgets.QLabel("00:00:00")
         self.time_display.setStyleSheet("font-size: 22px; font-weight: bold;")  # Slightly smaller
         self.time_display.setAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
         
         # Recording indicator
         self.recording_indicator = QtWidgets.QLabel("●")
-        self.recording_indicator.setStyleSheet("font-size: 24px; color: gray;")
+        self.recording_indicator.setStyleSheet("font-size: 24px;")
         self.recording_indicator.setAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
         self.recording_indicator.setFixedWidth(30)
+        # Painted with a cached color, so blinking doesn't re-apply a stylesheet
+        self._indicator_on_color = QtGui.QColor('#e63946')  # Red
+        self._indicator_off_color = QtGui.QColor('gray')
+        self.indicator_lit = False
+        self.recording_indicator.paintEvent = self.paint_recording_indicator
         
         # File status
-        self.file_status = QtWidgets.QLabel("Not recording")
-        self.file_status.setStyleSheet("font-style: italic;")
+        self.file_status = QtWidgets.QLabel()
+        self._last_file_status = None  # (text, style) currently shown
+        self.set_file_status("Not recording", "font-style: italic;")
         
         timer_layout.addWidget(self.recording_indicator)
         timer_layout.addWidget(self.time_display)
@@ -321,7 +402,7 @@ class AudioProAdvanced(QtWidgets.QMainWindow):
         button_layout = QtWidgets.QHBoxLayout()
         self.record_btn = QtWidgets.QPushButton("Start Recording")
         self.record_btn.clicked.connect(self.toggle_recording)
-        self.record_btn.setStyleSheet("font-size: 16px; padding: 8px;")
+        self.record_btn.setObjectName("recordButton")  # Styled by the application stylesheet
         
         # Replace Play button with Open Folder button
         self.folder_btn = QtWidgets.QPushButton("Open Destination Folder")
@@ -362,12 +443,40 @@ class AudioProAdvanced(QtWidgets.QMainWindow):
 
         # Store the current audio level for painting
         self.current_level = 0
+        
+        # Brushes and pen for painting the level meter, created once
+        # (the zone gradient brush depends on the height and is built on resize)
+        self._meter_bg_brush = QtGui.QBrush(QtGui.QColor('#FFFFFF'))
+        self._meter_tick_pen = QtGui.QPen(QtGui.QColor('#000000'))
+        self._meter_tick_pen.setWidth(1)
 
         # Waveform display
         self.waveform_label = QtWidgets.QLabel()
         self.waveform_label.setFixedHeight(180)
+        # The waveform is redrawn at the label's size, so don't let it dictate the layout
+        self.waveform_label.setSizePolicy(QtWidgets.QSizePolicy.Policy.Ignored, QtWidgets.QSizePolicy.Policy.Fixed)
         self.waveform_label.setAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
         self.waveform_label.setText("Waveform will appear here during recording")
+        # The rendered image is painted directly: a pixmap made from it would share
+        # (and so pin) the image memory the renderer wants to reuse
+        self.waveform_image = None
+        self.waveform_label.paintEvent = self.paint_waveform
+        self.waveform_pen = QtGui.QPen(QtGui.QColor('#4CAF50'))  # Green
+        self.waveform_pen.setWidthF(1.0)
+        
+        # Waveform images are rendered on a worker thread and delivered here
+        self.waveform_signals = WaveformRenderSignals()
+        self.waveform_buffers = WaveformBuffers()
+        self.waveform_signals.image_ready.connect(self.show_waveform)
+        self.waveform_signals.render_failed.connect(self.waveform_render_failed)
+        self._viz_in_flight = False
+        self._logged_viz_error = False  # Visualization errors are only reported once
+        
+        # Reusable float32 copy of the snapshot handed to the renderer; only
+        # refilled while no render is in flight, so the worker never sees it change
+        self._viz_buf = np.empty(self.recorder.chunk, dtype=np.float32)
+        # Reusable int16 array the newest ring buffer samples are copied into
+        self._viz_snapshot = np.empty(self.recorder.chunk, dtype=np.int16)
         
         # Add meter and waveform to visualization layout
         viz_layout.addLayout(meter_layout)
@@ -377,6 +486,8 @@ class AudioProAdvanced(QtWidgets.QMainWindow):
 
         # Now override the paintEvent in the level meter widget to draw the level
         self.level_meter_widget.paintEvent = self.paint_level_meter
+        self.level_meter_widget.resizeEvent = self.resize_level_meter
+        self.resize_level_meter(None)
 
         # Report progress
         self.report_progress_bar = QtWidgets.QProgressBar()
@@ -384,6 +495,11 @@ class AudioProAdvanced(QtWidgets.QMainWindow):
         self.report_progress_bar.setVisible(False)
         self.report_status = QtWidgets.QLabel("")
         
+        # Clears the report message some time after the last report finished
+        self.report_clear_timer = QTimer(self)
+        self.report_clear_timer.setSingleShot(True)
+        self.report_clear_timer.timeout.connect(self.report_status.clear)
+        
         report_layout = QtWidgets.QVBoxLayout()
         report_layout.addWidget(self.report_progress_bar)
         report_layout.addWidget(self.report_status)
@@ -394,133 +510,81 @@ class AudioProAdvanced(QtWidgets.QMainWindow):
 
         self.setCentralWidget(central_widget)
 
-        # Timer for real-time updates
+        # One timer drives all real-time updates while recording: visualization on
+        # every tick, time display and indicator blinking every RECORDING_SLOW_TICKS
         self.timer = QtCore.QTimer()
-        self.timer.timeout.connect(self.update_visualization)
-        
-        # Timer for time display updates
-        self.time_timer = QtCore.QTimer()
-        self.time_timer.timeout.connect(self.update_time_display)
-        
-        # Timer for blinking recording indicator
-        self.blink_timer = QtCore.QTimer()
-        self.blink_timer.timeout.connect(self.blink_recording_indicator)
+        self.timer.timeout.connect(self.on_recording_tick)
+        self.recording_tick = 0
+        self._viz_last_ms = 0  # Monotonic time (ms) of the last visualization update
+        self._viz_last_written = 0  # Ring sample count at the last visualization update
         self.blink_state = False
         
         # File monitoring thread
         self.file_monitor = None
-        
-        # Report generator thread
-        self.report_generator = None
 
     def update_codec_selection(self, index=None):
         """Update codec options based on selected format"""
-        self.codec_sel.clear()
-        fmt = self.format_sel.currentText()
-        
-        if fmt == "wav":
-            # Add bit depth information for each codec
-            self.codec_sel.addItems([
-                "pcm_s16le (16-bit)", 
-                "pcm_s24le (24-bit)", 
-                "pcm_f32le (32-bit float)", 
-                "alaw (8-bit A-law)", 
-                "mulaw (8-bit μ-law)"
-            ])
-            self.codec_sel.setCurrentText("pcm_s16le (16-bit)")
-            self.bitrate_sel.setEnabled(False)
-            
-            # If sample rate is 8000, recommend alaw/mulaw
-            if self.sample_rate_sel.currentText() == "8000":
-                msg = "8kHz sample rate is ideal for alaw/mulaw! Would you like to use one of these codecs?"
-                reply = QtWidgets.QMessageBox.question(self, "Codec Recommendation", msg,
-                    QtWidgets.QMessageBox.StandardButton.Yes | QtWidgets.QMessageBox.StandardButton.No)
-                if reply == QtWidgets.QMessageBox.StandardButton.Yes:
-                    self.codec_sel.setCurrentText("alaw (8-bit A-law)")
-            
-            # Verify codecs are supported
-            try:
-                codec_check = subprocess.run(
-                    ['ffmpeg', '-encoders'],
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE,
-                    check=True,
-                    timeout=2
-                )
-                codec_output = codec_check.stdout.decode('utf-8')
-                
-                # For alaw and mulaw, look for pcm_alaw and pcm_mulaw
-                if "pcm_alaw" not in codec_output:
-                    print("Warning: pcm_alaw (A-law) codec might not be supported")
-                if "pcm_mulaw" not in codec_output:
-                    print("Warning: pcm_mulaw (μ-law) codec might not be supported")
-            except Exception:
-                pass
-                
-        elif fmt == "mp3":
-            self.codec_sel.addItems(["libmp3lame"])
-            self.codec_sel.setCurrentText("libmp3lame")
-            self.bitrate_sel.setEnabled(True)
-        elif fmt == "ogg":
-            self.codec_sel.addItems(["libvorbis", "libopus"])
-            self.codec_sel.setCurrentText("libvorbis")
-            self.bitrate_sel.setEnabled(True)
-        elif fmt == "flac":
-            self.codec_sel.addItems(["flac"])
-            self.codec_sel.setCurrentText("flac")
-            self.bitrate_sel.setEnabled(False)
-        elif fmt == "m4a":
-            # Only standard AAC - removed HE-AAC options
-            self.codec_sel.addItems(["aac"])
-            self.codec_sel.setCurrentText("aac")
-            self.bitrate_sel.setEnabled(True)
+        fmt = self._apply_codec_options(self.format_sel, self.codec_sel, self.bitrate_sel)
+        self.check_codec_support(fmt)
+        self.update_codec_tip()
 
-    def update_codec_selection2(self, index=None):
-        """Update codec options for second format based on selected format"""
-        self.codec_sel2.clear()
-        fmt = self.format_sel2.currentText()
-        
-        if fmt == "wav":
-            # Add bit depth information for each codec
-            self.codec_sel2.addItems([
-                "pcm_s16le (16-bit)", 
-                "pcm_s24le (24-bit)", 
-                "pcm_f32le (32-bit float)", 
-                "alaw (8-bit A-law)", 
-                "mulaw (8-bit μ-law)"
-            ])
-            self.codec_sel2.setCurrentText("pcm_s16le (16-bit)")
-            self.bitrate_sel2.setEnabled(False)
-                
-        elif fmt == "mp3":
-            self.codec_sel2.addItems(["libmp3lame"])
-            self.codec_sel2.setCurrentText("libmp3lame")
-            self.bitrate_sel2.setEnabled(True)
-        elif fmt == "ogg":
-            self.codec_sel2.addItems(["libvorbis", "libopus"])
-            self.codec_sel2.setCurrentText("libvorbis")
-            self.bitrate_sel2.setEnabled(True)
-        elif fmt == "flac":
-            self.codec_sel2.addItems(["flac"])
-            self.codec_sel2.setCurrentText("flac")
-            self.bitrate_sel2.setEnabled(False)
-        elif fmt == "m4a":
-            # Only standard AAC - removed HE-AAC options
-            self.codec_sel2.addItems(["aac"])
-            self.codec_sel2.setCurrentText("aac")
-            self.bitrate_sel2.setEnabled(True)
+    def check_codec_support(self, fmt):
+        """Warn about WAV codecs FFmpeg doesn't support (skipped until FFmpeg was queried)"""
+        encoders = self.recorder.ffmpeg_encoders
+        if fmt == "wav" and encoders:
+            # For alaw and mulaw, look for pcm_alaw and pcm_mulaw
+            if "pcm_alaw" not in encoders:
+                print("Warning: pcm_alaw (A-law) codec might not be supported")
+            if "pcm_mulaw" not in encoders:
+                print("Warning: pcm_mulaw (μ-law) codec might not be supported")
+
+    def set_ffmpeg_encoders(self, encoders):
+        """Store the encoder list from EncoderProbeTask"""
+        self.recorder.ffmpeg_encoders = encoders
+        self.check_codec_support(self.format_sel.currentText())
+
+    def update_codec_tip(self):
+        """Show the A-law/μ-law suggestion when WAV is recorded at 8 kHz"""
+        self.codec_tip.setVisible(
+            self.format_sel.currentText() == "wav" and self.sample_rate_sel.currentText() == "8000"
+        )
+
+    def _apply_codec_options(self, format_combo, codec_combo, bitrate_combo, index=None):
+        """
+        Fill a codec menu for the format selected in format_combo and return that format
+        (index is the currentIndexChanged argument and is not used)
+        """
+        fmt = format_combo.currentText()
+        codecs, default_codec, bitrate_enabled = CODEC_TABLE[fmt]
+        
+        # Repopulate as one change: no intermediate signals or repaints
+        codec_combo.blockSignals(True)
+        codec_combo.setUpdatesEnabled(False)
+        try:
+            codec_combo.clear()
+            codec_combo.addItems(codecs)
+            codec_combo.setCurrentText(default_codec)
+        finally:
+            codec_combo.setUpdatesEnabled(True)
+            codec_combo.blockSignals(False)
+        bitrate_combo.setEnabled(bitrate_enabled)
+        return fmt
 
     def populate_input_devices(self):
-        """Populate the input device dropdown with available devices"""
-        self.device_combo.clear()
-        info = {}
-        
-        for i in range(self.recorder.audio.get_device_count()):
-            device_info = self.recorder.audio.get_device_info_by_index(i)
-            if device_info["maxInputChannels"] > 0:
-                name = device_info["name"]
-                info[name] = i
-                self.device_combo.addItem(name)
+        """Populate the input device dropdown with available devices (in the background)"""
+        QtCore.QThreadPool.globalInstance().start(DeviceEnumTask(self.probe_signals))
+
+    def fill_input_devices(self, devices):
+        """Fill the input device dropdown with the devices found by DeviceEnumTask"""
+        self.device_combo.blockSignals(True)
+        self.device_combo.setUpdatesEnabled(False)
+        try:
+            self.device_combo.clear()
+            for name, index in devices:
+                self.device_combo.addItem(name, index)
+        finally:
+            self.device_combo.setUpdatesEnabled(True)
+            self.device_combo.blockSignals(False)
 
     def update_sample_rate(self):
         """Update sample rate and suggest appropriate codecs"""
@@ -532,6 +596,8 @@ class AudioProAdvanced(QtWidgets.QMainWindow):
                 if "alaw" in self.codec_sel.itemText(i):
                     self.codec_sel.setCurrentIndex(i)
                     break
+        
+        self.update_codec_tip()
 
     def browse_output_folder(self):
         """Open dialog to select output folder"""
@@ -549,23 +615,8 @@ class AudioProAdvanced(QtWidgets.QMainWindow):
     def start_recording(self):
         """Start audio recording"""
         try:
-            # Ensure temp directory exists
-            if not os.path.exists(self.temp_dir):
-                os.makedirs(self.temp_dir)
-            
-            # Get selected device index
-            device_name = self.device_combo.currentText()
-            device_index = None
-            
-            for i in range(self.recorder.audio.get_device_count()):
-                info = self.recorder.audio.get_device_info_by_index(i)
-                if info["name"] == device_name:
-                    device_index = i
-                    break
-            
-            # Use first device if we can't find a match
-            if device_index is None and self.device_combo.count() > 0:
-                device_index = self.recorder.audio.get_device_info_by_index(0)["index"]
+            # Get selected device index (stored with each combo item; None if no devices)
+            device_index = self.device_combo.currentData()
             
             # Check if dual format recording is enabled
             dual_format_enabled = self.dual_format_group.isChecked()
@@ -599,24 +650,27 @@ class AudioProAdvanced(QtWidgets.QMainWindow):
                 self.last_recorded_file2 = self.recorder.output_file2 if dual_format_enabled else None
                 
                 # Start timers
-                self.recording_start_time = time.time()
-                self.timer.start(50)  # Update visualization every 50ms
-                self.time_timer.start(1000)  # Update timer every second
-                
-                # Start recording indicator blinking
-                self.blink_timer.start(500)  # Blink every 500ms
+                self.elapsed_timer.start()
+                self.time_display_seconds = None
+                self.update_time_display()
+                self.recording_tick = 0
+                self._viz_last_written = 0  # The ring restarts from zero
+                self.timer.start(self.RECORDING_TICK_MS)
                 
                 # Start file monitoring
-                self.file_monitor = FileMonitorThread(self.recorder.output_file)
+                self.file_monitor = FileMonitorThread(
+                    self.recorder.output_file,
+                    self.recorder.output_file2 if dual_format_enabled else None
+                )
                 self.file_monitor.file_status.connect(self.update_file_status)
                 self.file_monitor.start()
                 
                 # Update UI
                 self.record_btn.setText("Stop Recording")
-                self.record_btn.setStyleSheet("background-color: #e63946; color: white; font-size: 16px; padding: 8px; border-radius: 4px;")
+                self.set_record_button_recording(True)
                 self.folder_btn.setEnabled(False)
-                self.file_status.setText("Starting recording..." + (" (dual format)" if dual_format_enabled else ""))
-                self.file_status.setStyleSheet("color: #FFC107; font-weight: bold;")  # Yellow
+                self.set_file_status("Starting recording..." + (" (dual format)" if dual_format_enabled else ""),
+                                     self._STATUS_YELLOW)
                 self.statusBar().showMessage("Recording in progress..." + (" (dual format)" if dual_format_enabled else ""))
         
         except Exception as e:
@@ -625,19 +679,20 @@ class AudioProAdvanced(QtWidgets.QMainWindow):
     def queue_report_generation(self, audio_file):
         """Add a file to the report generation queue"""
         if audio_file and os.path.exists(audio_file):
+            # Let the kernel read the file ahead while earlier reports are running
+            prefetch_file(audio_file)
             self.report_queue.append(audio_file)
-            # Start processing queue if not already running
-            if not self.is_report_processing:
-                self.process_report_queue()
+            # Start processing queue if a report slot is free
+            self.process_report_queue()
 
     def process_report_queue(self):
+        """Start reports for queued files while report slots are free"""
+        while self.report_queue and len(self.report_generators) < self.MAX_PARALLEL_REPORTS:
+            self.process_next_report()
+
+    def process_next_report(self):
         """Process the next file in the report queue"""
-        if not self.report_queue:
-            self.is_report_processing = False
-            return
-            
-        self.is_report_processing = True
-        file_to_process = self.report_queue[0]
+        file_to_process = self.report_queue.pop(0)
         
         # Find appropriate format selector and codec selector based on file extension
         file_ext = os.path.splitext(file_to_process)[1].lower()[1:]  # Get extension without dot
@@ -669,50 +724,65 @@ class AudioProAdvanced(QtWidgets.QMainWindow):
                         break
                         
         # Start report generation
-        self.start_report_generation(file_to_process, format_sel, codec_sel, bitrate_sel)
+        self.start_report_generation(file_to_process, codec_sel, bitrate_sel)
 
-    def start_report_generation(self, audio_file=None, format_sel=None, codec_sel=None, bitrate_sel=None):
+    def start_report_generation(self, audio_file=None, codec_sel=None, bitrate_sel=None):
         """Start report generation in a separate thread"""
         # Use provided file or last recorded file
         file_to_process = audio_file if audio_file else self.last_recorded_file
         
         if not file_to_process or not os.path.exists(file_to_process):
             QtWidgets.QMessageBox.warning(self, "Error", "No valid audio file to process")
-            # Continue with next file in queue if this one fails
-            self.handle_report_finished(False, "Invalid file")
+            self.report_status.setText("Report error: Invalid file")
+            self.report_status.setStyleSheet("color: #e63946;")  # Red
             return
             
         # Use provided selectors or defaults
-        format_selector = format_sel if format_sel else self.format_sel
         codec_selector = codec_sel if codec_sel else self.codec_sel
         bitrate_selector = bitrate_sel if bitrate_sel else self.bitrate_sel
+        
+        # Read the settings now, on the GUI thread: the report runs in parallel
+        # with others, and the next queued file may change these selectors
+        codec = codec_selector.currentText()
+        bitrate = bitrate_selector.currentText() if bitrate_selector.isEnabled() else None
             
         # Show progress
+        self.report_clear_timer.stop()
         self.report_status.setText(f"Preparing report for {os.path.basename(file_to_process)}...")
         self.report_progress_bar.setVisible(True)
         
         # Create and start report thread
-        self.report_generator = ReportGeneratorThread(
+        report_generator = ReportGeneratorThread(
             file_to_process, 
-            format_selector, 
-            codec_selector, 
-            bitrate_selector, 
+            codec, 
+            bitrate, 
             self.temp_dir
         )
-        self.report_generator.report_progress.connect(self.handle_report_progress)
-        self.report_generator.report_finished.connect(self.handle_report_finished)
-        self.report_generator.start()
+        report_generator.report_progress.connect(self.handle_report_progress)
+        report_generator.report_finished.connect(self.handle_report_finished)
+        self.report_generators.append(report_generator)
+        report_generator.start()
 
     def update_visualization(self):
         """Update real-time visualization during recording"""
         try:
-            if not self.recorder.frames:
+            # Nothing to redraw if no audio arrived since the last update
+            written = self.recorder.viz_ring.written
+            if written == self._viz_last_written:
+                return
+                
+            # Drop ticks that arrive faster than the display rate instead of queueing work
+            now_ms = int(time.monotonic() * 1000)
+            if now_ms - self._viz_last_ms < self.VIZ_MIN_INTERVAL_MS:
                 return
+            self._viz_last_ms = now_ms
+            self._viz_last_written = written
                 
-            audio_data = np.frombuffer(self.recorder.frames[-1], dtype=np.int16)
+            # Snapshot the newest samples into a reused array (no allocation per tick)
+            audio_data = self.recorder.viz_ring.latest(self.recorder.chunk, out=self._viz_snapshot)
             
-            # Calculate peak level
-            peak = float(np.abs(audio_data).max())
+            # Peak level of the latest chunk, tracked by the audio callback
+            peak = float(self.recorder.last_peak)
             
             # Scale peak value to meter range (0-100)
             # Using logarithmic scaling for better visual response
@@ -724,37 +794,11 @@ class AudioProAdvanced(QtWidgets.QMainWindow):
             else:
                 self.current_level = 0
                 
-            # Print debug info
-            #print(f"Peak: {peak:.2f}, Level: {self.current_level:.1f}%, dB: {20 * np.log10(max(1, peak) / 32767):.1f}")
-            
             # Request a repaint of the level meter
             self.level_meter_widget.update()
             
-            # Ensure temp directory exists
-            if not os.path.exists(self.temp_dir):
-                os.makedirs(self.temp_dir)
-                
             # Draw waveform
-            plt.figure(figsize=(6,2), facecolor='white')
-            plt.plot(audio_data, linewidth=0.8, color='#4CAF50')  # Changed to green
-            plt.axis('off')
-            plt.tight_layout()
-            
-            temp_file = os.path.join(self.temp_dir, 'live_waveform.png')
-            plt.savefig(temp_file, facecolor='white')
-            plt.close()
-            
-            # Verify file was created before using it
-            if os.path.exists(temp_file):
-                pixmap = QtGui.QPixmap(temp_file)
-                self.waveform_label.setPixmap(pixmap.scaled(
-                    self.waveform_label.width(), 
-                    self.waveform_label.height(), 
-                    QtCore.Qt.AspectRatioMode.KeepAspectRatio
-                ))
-            else:
-                # If file doesn't exist, show only text
-                self.waveform_label.setText("Updating visualization...")
+            self.render_waveform(audio_data, peak)
             
         except Exception as e:
             # Print full exception for debugging
@@ -762,63 +806,126 @@ class AudioProAdvanced(QtWidgets.QMainWindow):
             traceback.print_exc()
             
             # Limit error messages
-            if not hasattr(self, '_logged_viz_error'):
+            if not self._logged_viz_error:
                 self._logged_viz_error = True
                 self.statusBar().showMessage(f"Visualization error: {str(e)}")
                 print(f"Error updating visualization: {e}")
 
+    def render_waveform(self, audio_data, peak):
+        """Render the waveform on a worker thread; the image comes back via show_waveform"""
+        # Skip this snapshot if the previous one is still being drawn
+        width = self.waveform_label.width()
+        height = self.waveform_label.height()
+        if self._viz_in_flight or width <= 0 or height <= 0:
+            return
+        self._viz_in_flight = True
+        
+        # Convert into the preallocated buffer instead of a new array per frame
+        n = min(audio_data.size, self._viz_buf.size)
+        samples = self._viz_buf[:n]
+        np.copyto(samples, audio_data[-n:])
+        
+        task = WaveformRenderTask(self.waveform_signals, self.waveform_buffers, samples, peak, width, height, self.waveform_pen)
+        QtCore.QThreadPool.globalInstance().start(task)
+
+    def show_waveform(self, image):
+        """Display a waveform image rendered by WaveformRenderTask"""
+        self._viz_in_flight = False
+        self.waveform_image = image
+        self.waveform_label.update()
+
+    def waveform_render_failed(self, message):
+        """Handle a failed WaveformRenderTask; the next tick tries again"""
+        self._viz_in_flight = False
+        
+        # Limit error messages
+        if not self._logged_viz_error:
+            self._logged_viz_error = True
+            self.statusBar().showMessage(f"Visualization error: {message}")
+            print(f"Error rendering waveform: {message}")
+
+    def paint_waveform(self, event):
+        """Paint the latest waveform image, or the placeholder text before the first one"""
+        if self.waveform_image is None:
+            QtWidgets.QLabel.paintEvent(self.waveform_label, event)
+            return
+        painter = QtGui.QPainter(self.waveform_label)
+        painter.drawImage(0, 0, self.waveform_image)
+        painter.end()
+
+    def on_recording_tick(self):
+        """Dispatch the periodic updates while recording"""
+        self.recording_tick += 1
+        self.update_visualization()
+        if self.recording_tick % self.RECORDING_SLOW_TICKS == 0:
+            # Twice a second: seconds don't skip, and the indicator blinks
+            self.update_time_display()
+            self.blink_recording_indicator()
+
+    def set_record_button_recording(self, recording):
+        """Switch the record button between its idle (blue) and recording (red) style"""
+        # Re-polish so the [recording="true"] stylesheet rule is re-evaluated
+        self.record_btn.setProperty("recording", recording)
+        self.record_btn.style().unpolish(self.record_btn)
+        self.record_btn.style().polish(self.record_btn)
+
     def update_time_display(self):
-        """Update recording time display with milliseconds"""
-        elapsed = time.time() - self.recording_start_time
-        time_str = format_time(elapsed)  # Using the updated format_time function
-        self.time_display.setText(time_str)
+        """Update recording time display (hours:minutes:seconds)"""
+        total_seconds = self.elapsed_timer.elapsed() // 1000
+        if total_seconds == self.time_display_seconds:
+            return  # Updated twice a second, so every other call shows the same time
+        self.time_display_seconds = total_seconds
+        
+        minutes, seconds = divmod(total_seconds, 60)
+        hours, minutes = divmod(minutes, 60)
+        self.time_display.setText(f"{hours:02d}:{minutes:02d}:{seconds:02d}")
     
     def blink_recording_indicator(self):
         """Make recording indicator blink"""
-        if self.blink_state:
-            self.recording_indicator.setStyleSheet("font-size: 24px; color: #e63946;")  # Red on
-        else:
-            self.recording_indicator.setStyleSheet("font-size: 24px; color: gray;")  # Off
+        self.indicator_lit = self.blink_state  # Red on / off
+        self.recording_indicator.update()
         
         self.blink_state = not self.blink_state
+
+    def paint_recording_indicator(self, event):
+        """Paint the recording indicator dot in its current color"""
+        painter = QtGui.QPainter(self.recording_indicator)
+        painter.setPen(self._indicator_on_color if self.indicator_lit else self._indicator_off_color)
+        painter.drawText(self.recording_indicator.rect(), QtCore.Qt.AlignmentFlag.AlignCenter,
+                         self.recording_indicator.text())
+        painter.end()
     
-    def update_file_status(self, is_recording, file_size_kb):
-        """Update recording file status"""
+    def update_file_status(self, is_recording, file_size_kb, file2_size_kb):
+        """Update recording file status (sizes come from the file monitor thread)"""
         if is_recording:
-            # Format file size
-            if file_size_kb < 1024:
-                size_str = f"{file_size_kb} KB"
-            else:
-                size_str = f"{file_size_kb/1024:.1f} MB"
+            size_str = _format_size_kb(file_size_kb)
             
             # Check if dual format is enabled
-            dual_format = hasattr(self.recorder, 'dual_format_enabled') and self.recorder.dual_format_enabled
+            dual_format = self.recorder.dual_format_enabled
             
             # Update status with size information
             if dual_format:
-                # For dual format, try to get the second file size
-                second_file_size = 0
-                if hasattr(self.recorder, 'output_file2') and self.recorder.output_file2 and os.path.exists(self.recorder.output_file2):
-                    second_file_size = os.path.getsize(self.recorder.output_file2) / 1024
-                
-                # Format second file size
-                if second_file_size < 1024:
-                    size_str2 = f"{int(second_file_size)} KB"
-                else:
-                    size_str2 = f"{second_file_size/1024:.1f} MB"
-                
-                self.file_status.setText(f"Recording active: {size_str} + {size_str2}")
+                text = f"Recording active: {size_str} + {_format_size_kb(file2_size_kb)}"
             else:
-                self.file_status.setText(f"Recording active: {size_str}")
+                text = f"Recording active: {size_str}"
             
-            # Change color based on file growth
-            if file_size_kb > 0:
-                self.file_status.setStyleSheet("color: #4CAF50; font-weight: bold;")  # Green
-            else:
-                self.file_status.setStyleSheet("color: #FFC107; font-weight: bold;")  # Yellow warning
+            # Change color based on file growth: green, or yellow warning
+            style = self._STATUS_GREEN if file_size_kb > 0 else self._STATUS_YELLOW
         else:
-            self.file_status.setText("Not recording")
-            self.file_status.setStyleSheet("font-style: italic; color: gray;")
+            text = "Not recording"
+            style = self._STATUS_IDLE
+        
+        self.set_file_status(text, style)
+    
+    def set_file_status(self, text, style):
+        """Show a file status message, skipping text layout and restyling when unchanged"""
+        if (text, style) == self._last_file_status:
+            return
+        if self._last_file_status is None or text != self._last_file_status[0]:
+            self.file_status.setText(text)
+        if self._last_file_status is None or style != self._last_file_status[1]:
+            self.file_status.setStyleSheet(style)
+        self._last_file_status = (text, style)
     
     def handle_report_progress(self, message):
         """Handle report progress updates"""
@@ -826,8 +933,10 @@ class AudioProAdvanced(QtWidgets.QMainWindow):
         
     def handle_report_finished(self, success, message):
         """Handle report generation completion"""
-        # Clear the report generator reference
-        self.report_generator = None
+        # Drop the reference to the finished report generator
+        report_generator = self.sender()
+        if report_generator in self.report_generators:
+            self.report_generators.remove(report_generator)
         
         if success:
             self.report_status.setText(f"Report saved: {message}")
@@ -836,19 +945,13 @@ class AudioProAdvanced(QtWidgets.QMainWindow):
             self.report_status.setText(f"Report error: {message}")
             self.report_status.setStyleSheet("color: #e63946;")  # Red
         
-        # Remove the processed file from the queue
-        if self.report_queue:
-            self.report_queue.pop(0)
-        
         # Continue processing queue if there are more files
-        if self.report_queue:
-            # Use a timer to create a small delay between reports
-            QtCore.QTimer.singleShot(1000, self.process_report_queue)
-        else:
-            self.is_report_processing = False
+        self.process_report_queue()
+        
+        if not self.report_generators:
             self.report_progress_bar.setVisible(False)
             # Hide message after 15 seconds
-            QtCore.QTimer.singleShot(15000, lambda: self.report_status.setText(""))
+            self.report_clear_timer.start(15000)
 
     def show_report_dialog(self):
         """Show dialog to select an audio file for report generation"""
@@ -882,9 +985,9 @@ class AudioProAdvanced(QtWidgets.QMainWindow):
         try:
             second_file = None
             
-            if hasattr(self.recorder, 'output_file2') and self.recorder.output_file2 and os.path.exists(self.recorder.output_file2):
+            if self.recorder.output_file2 and os.path.exists(self.recorder.output_file2):
                 second_file = self.recorder.output_file2
-            elif hasattr(self, 'last_recorded_file2') and self.last_recorded_file2 and os.path.exists(self.last_recorded_file2):
+            elif self.last_recorded_file2 and os.path.exists(self.last_recorded_file2):
                 second_file = self.last_recorded_file2
                 
             if second_file:
@@ -920,23 +1023,20 @@ class AudioProAdvanced(QtWidgets.QMainWindow):
             self.stop_recording()
             
         # Stop active threads
-        if hasattr(self, 'file_monitor') and self.file_monitor:
+        if self.file_monitor:
             self.file_monitor.stop()
             self.file_monitor.wait()
             
-        if hasattr(self, 'report_generator') and self.report_generator:
-            self.report_generator.terminate()
-            self.report_generator.wait()
+        for report_generator in self.report_generators:
+            report_generator.terminate()
+            report_generator.wait()
             
         # Terminate PyAudio
         self.recorder.cleanup()
         
-        # Clean up temporary files
-        try:
-            if os.path.exists(self.temp_dir):
-                shutil.rmtree(self.temp_dir)
-        except Exception as e:
-            print(f"Error cleaning temporary files: {e}")
+        # Clean up temporary files in the background so the window closes at once.
+        # Not a daemon thread: the interpreter waits for it before exiting.
+        threading.Thread(target=clean_temp_directory, args=(self.temp_dir,)).start()
             
         event.accept()
 
@@ -944,15 +1044,14 @@ class AudioProAdvanced(QtWidgets.QMainWindow):
         """Stop audio recording"""
         try:
             # Check if dual format was being used
-            dual_format = hasattr(self.recorder, 'dual_format_enabled') and self.recorder.dual_format_enabled
+            dual_format = self.recorder.dual_format_enabled
             
-            # Stop timers
+            # Stop timer
             self.timer.stop()
-            self.time_timer.stop()
-            self.blink_timer.stop()
             
             # Reset recording indicator
-            self.recording_indicator.setStyleSheet("font-size: 24px; color: gray;")
+            self.indicator_lit = False
+            self.recording_indicator.update()
             
             # Stop file monitoring
             if self.file_monitor:
@@ -961,28 +1060,27 @@ class AudioProAdvanced(QtWidgets.QMainWindow):
                 self.file_monitor = None
             
             # Reset file status
-            self.file_status.setText("Processing..." + (" (dual format)" if dual_format else ""))
-            self.file_status.setStyleSheet("color: #1a73e8; font-weight: bold;")
+            self.set_file_status("Processing..." + (" (dual format)" if dual_format else ""), self._STATUS_BUSY)
             
             # Stop the recording
             success = self.recorder.stop_recording()
             
             # Update UI
             self.record_btn.setText("Start Recording")
-            self.record_btn.setStyleSheet(f"background-color: {self.primary_blue}; color: white; font-size: 16px; padding: 8px; border-radius: 4px;")
+            self.set_record_button_recording(False)
             
             if success:
                 self.folder_btn.setEnabled(True)
                 
                 # Store output file references for later use
                 self.last_recorded_file = self.recorder.output_file
-                if dual_format and hasattr(self.recorder, 'output_file2') and self.recorder.output_file2:
+                if dual_format and self.recorder.output_file2:
                     self.last_recorded_file2 = self.recorder.output_file2
                     # Enable the "Open Second Format Folder" menu item
                     self.play_second_format_action.setEnabled(True)
                 
                 status_msg = f"Recording saved: {self.recorder.output_file}"
-                if dual_format and hasattr(self.recorder, 'output_file2') and self.recorder.output_file2:
+                if dual_format and self.recorder.output_file2:
                     status_msg += f" and {self.recorder.output_file2}"
                 self.statusBar().showMessage(status_msg)
                 
@@ -999,7 +1097,7 @@ class AudioProAdvanced(QtWidgets.QMainWindow):
                     self.queue_report_generation(self.recorder.output_file)
                     
                     # If dual format was used, add second file to report queue
-                    if dual_format and hasattr(self.recorder, 'output_file2') and self.recorder.output_file2 and os.path.exists(self.recorder.output_file2):
+                    if dual_format and self.recorder.output_file2 and os.path.exists(self.recorder.output_file2):
                         QtWidgets.QMessageBox.information(
                             self,
                             "Dual Format Report",
@@ -1013,6 +1111,32 @@ class AudioProAdvanced(QtWidgets.QMainWindow):
         except Exception as e:
             QtWidgets.QMessageBox.warning(self, "Warning", f"Problem stopping recording: {str(e)}")
 
+    def resize_level_meter(self, event):
+        """Recompute the level meter zone boundaries and tick lines for the new size"""
+        width = self.level_meter_widget.width()
+        height = self.level_meter_widget.height()
+        
+        # Zone colors as a single gradient brush with hard edges between zones:
+        # red is the top 10% (0 to -10dB), yellow the next 20% (-10dB to -30dB)
+        # and green the rest (-30dB to -60dB)
+        gradient = QtGui.QLinearGradient(0, 0, 0, max(height, 1))
+        if height > 0:
+            yellow_top = int(height * 0.1) / height
+            green_top = int(height * 0.3) / height
+            gradient.setColorAt(0.0, QtGui.QColor('#FF4444'))  # Red
+            gradient.setColorAt(max(yellow_top - 1e-6, 0.0), QtGui.QColor('#FF4444'))
+            gradient.setColorAt(yellow_top, QtGui.QColor('#FFFF00'))  # Yellow
+            gradient.setColorAt(max(green_top - 1e-6, 0.0), QtGui.QColor('#FFFF00'))
+            gradient.setColorAt(green_top, QtGui.QColor('#44FF44'))  # Green
+            gradient.setColorAt(1.0, QtGui.QColor('#44FF44'))
+        self._meter_level_brush = QtGui.QBrush(gradient)
+        
+        # Tick marks at 0dB (0%), -20dB (33%) and -40dB (66%)
+        self._meter_tick_lines = [
+            QtCore.QLineF(0, int(height * ratio), width, int(height * ratio))
+            for ratio in (0.0, 0.33, 0.66)
+        ]
+
     def paint_level_meter(self, event):
         """Custom paint method for the level meter widget"""
         painter = QtGui.QPainter(self.level_meter_widget)
@@ -1022,41 +1146,16 @@ class AudioProAdvanced(QtWidgets.QMainWindow):
         height = self.level_meter_widget.height()
         
         # Draw background
-        painter.fillRect(0, 0, width, height, QtGui.QColor('#FFFFFF'))  # Dark gray background
+        painter.fillRect(0, 0, width, height, self._meter_bg_brush)  # White background
         
         # Calculate the level height (inverted - 0 at top, 100 at bottom)
         level_height = int(height * (1 - self.current_level / 100))
         
-        # Draw the level meter (from bottom up)
-        # Red for top 10% of range (0 to -10dB)
-        if self.current_level > 90:
-            red_zone_height = min(int(height * 0.1), height - level_height)
-            painter.fillRect(0, level_height, width, red_zone_height, QtGui.QColor('#FF4444'))  # Red
-            
-        # Yellow for next 20% of range (-10dB to -30dB)
-        if self.current_level > 70:
-            yellow_start = max(level_height, int(height * 0.1))
-            yellow_height = min(int(height * 0.2), height - yellow_start)
-            painter.fillRect(0, yellow_start, width, yellow_height, QtGui.QColor('#FFFF00'))  # Yellow
-            
-        # Green for the rest (-30dB to -60dB)
-        if self.current_level > 0:
-            green_start = max(level_height, int(height * 0.3))
-            green_height = height - green_start
-            painter.fillRect(0, green_start, width, green_height, QtGui.QColor('#44FF44'))  # Green
-        
-        # Draw tick marks for reference
-        pen = QtGui.QPen(QtGui.QColor('#000000'))
-        pen.setWidth(1)
-        painter.setPen(pen)
-        
-        # 0dB mark at 0% height
-        painter.drawLine(0, int(height * 0.0), width, int(height * 0.0))
-        
-        # -20dB mark at 33% height
-        painter.drawLine(0, int(height * 0.33), width, int(height * 0.33))
+        # Draw the level meter (from bottom up); the zone colors come from the gradient
+        painter.fillRect(0, level_height, width, height - level_height, self._meter_level_brush)
         
-        # -40dB mark at 66% height
-        painter.drawLine(0, int(height * 0.66), width, int(height * 0.66))
+        # Draw tick marks for reference in a single call
+        painter.setPen(self._meter_tick_pen)
+        painter.drawLines(self._meter_tick_lines)
         
         painter.end()
\ No newline at end of file
@@ -8,12 +8,33 @@ import os
 import shutil
 import subprocess
 import sys
+import tempfile
 import hashlib
+import mmap
 import datetime
+from functools import lru_cache
+import numpy as np
 
 # Define application version - used consistently across the application
 APP_VERSION = "1.0.1"
 
+def get_temp_directory_path():
+    """
+    Get a per-process temporary directory path, preferring RAM-backed storage
+    
+    On Linux /dev/shm is a tmpfs, so temporary files there never touch the disk;
+    elsewhere the system temporary directory is used.
+    
+    Returns:
+        str: Path of the temporary directory (not created)
+    """
+    shm = '/dev/shm'
+    if os.path.isdir(shm) and os.access(shm, os.W_OK):
+        base = shm
+    else:
+        base = tempfile.gettempdir()
+    return os.path.join(base, f"kvsrecorder-{os.getpid()}")
+
 def create_temp_directory(dir_path):
     """
     Create a temporary directory if it doesn't exist
@@ -52,6 +73,17 @@ def clean_temp_directory(dir_path):
             return False
     return True
 
+# Launcher for the platform's default application, chosen once at import.
+# Popen returns as soon as the helper is started instead of waiting for it.
+if sys.platform == 'win32':
+    _open_with_default_app = os.startfile
+elif sys.platform == 'darwin':  # macOS
+    def _open_with_default_app(path):
+        subprocess.Popen(['open', path])
+else:  # Linux
+    def _open_with_default_app(path):
+        subprocess.Popen(['xdg-open', path])
+
 def open_file_with_default_app(file_path):
     """
     Open a file with the system's default application
@@ -66,12 +98,7 @@ def open_file_with_default_app(file_path):
         if not os.path.exists(file_path):
             return False
             
-        if sys.platform == 'win32':
-            os.startfile(file_path)
-        elif sys.platform == 'darwin':  # macOS
-            subprocess.run(['open', file_path])
-        else:  # Linux
-            subprocess.run(['xdg-open', file_path])
+        _open_with_default_app(file_path)
         return True
     except Exception as e:
         print(f"Error opening file: {e}")
@@ -91,12 +118,7 @@ def open_directory(directory_path):
         if not os.path.exists(directory_path):
             return False
             
-        if sys.platform == 'win32':
-            os.startfile(directory_path)
-        elif sys.platform == 'darwin':  # macOS
-            subprocess.run(['open', directory_path])
-        else:  # Linux
-            subprocess.run(['xdg-open', directory_path])
+        _open_with_default_app(directory_path)
         return True
     except Exception as e:
         print(f"Error opening directory: {e}")
@@ -113,25 +135,113 @@ def format_time(seconds, include_milliseconds=True):
     Returns:
         str: Formatted time string (00:00:00.000)
     """
-    # Split seconds into whole seconds and milliseconds
-    whole_seconds = int(seconds)
-    milliseconds = int((seconds - whole_seconds) * 1000)
+    text = _format_hms_ms(seconds)
+    return text if include_milliseconds else text[:-4]
+
+def format_file_size(size_bytes):
+    """
+    Format a file size as B, KB or MB
     
-    # Calculate hours, minutes, seconds
-    hours = whole_seconds // 3600
-    minutes = (whole_seconds % 3600) // 60
-    seconds = whole_seconds % 60
+    Args:
+        size_bytes: Size in bytes
+        
+    Returns:
+        str: Formatted size (e.g. "1.50 MB")
+    """
+    if size_bytes < 1 << 10:
+        return f"{size_bytes} B"
+    if size_bytes < 1 << 20:
+        return f"{size_bytes / 1024:.2f} KB"
+    return f"{size_bytes / 1048576:.2f} MB"
+
+def _format_hms_ms(total_seconds):
+    """Format seconds as 00:00:00.000 (hours, minutes, seconds, milliseconds)"""
+    whole_seconds = int(total_seconds)
+    milliseconds = int((total_seconds - whole_seconds) * 1000)
+    minutes, seconds = divmod(whole_seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d}.{milliseconds:03d}"
+
+@lru_cache(maxsize=8)
+def _minmax_buckets(n, n_buckets):
+    """Bucket start indices and plot positions for downsample_minmax (read-only, cached per size)"""
+    starts = np.linspace(0, n, n_buckets, endpoint=False).astype(np.int64)
+    positions = np.repeat(starts, 2)
+    starts.flags.writeable = False
+    positions.flags.writeable = False
+    return starts, positions
+
+def downsample_minmax(data, n_buckets):
+    """
+    Reduce samples to a min/max envelope for plotting
     
-    # Format with or without milliseconds
-    if include_milliseconds:
-        return f"{hours:02d}:{minutes:02d}:{seconds:02d}.{milliseconds:03d}"
-    else:
-        return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+    The samples are split into n_buckets equal buckets and each bucket is
+    replaced by its minimum followed by its maximum, so peaks survive the
+    downsampling (unlike plain decimation). The bucket layout only depends on
+    the sizes and is cached, so a call only allocates the result array.
+    
+    Args:
+        data: 1-D array of samples
+        n_buckets: Number of buckets (usually the plot width in pixels)
+        
+    Returns:
+        tuple: (positions, values) - the sample index each value is plotted at
+               and the interleaved min/max values
+    """
+    data = np.asarray(data)
+    n = data.size
+    if n_buckets * 2 >= n or n_buckets < 1:
+        return np.arange(n), data
+        
+    starts, positions = _minmax_buckets(n, n_buckets)
+    values = np.empty(positions.size, dtype=data.dtype)
+    np.minimum.reduceat(data, starts, out=values[0::2])
+    np.maximum.reduceat(data, starts, out=values[1::2])
+    
+    return positions, values
+
+def probe_ffmpeg_encoders():
+    """
+    Get the names of the encoders the installed FFmpeg supports
+    
+    Runs `ffmpeg -encoders` once; callers should keep the result instead of
+    probing again.
+    
+    Returns:
+        frozenset: Encoder names (e.g. "pcm_alaw"), empty if FFmpeg can't be queried
+    """
+    try:
+        result = subprocess.run(
+            ['ffmpeg', '-encoders'],
+            capture_output=True,
+            text=True,
+            errors='replace',
+            check=True,
+            timeout=2
+        )
+    except Exception as e:
+        print(f"Warning: Unable to query FFmpeg for encoders: {e}")
+        return frozenset()
+        
+    # Encoder lines follow the " ------" separator: " A....D pcm_alaw   PCM A-law ..."
+    encoders = set()
+    in_list = False
+    for line in result.stdout.splitlines():
+        fields = line.split()
+        if not in_list:
+            in_list = bool(fields) and fields[0].startswith('---')
+        elif len(fields) >= 2:
+            encoders.add(fields[1])
+    return frozenset(encoders)
 
+@lru_cache(maxsize=1)
 def get_available_codecs():
     """
     Get a list of available audio codecs by querying FFmpeg
     
+    FFmpeg is only queried on the first call; later calls return the same
+    dictionary, which callers must not modify.
+    
     Returns:
         dict: Dictionary of available codecs by format
     """
@@ -143,32 +253,20 @@ def get_available_codecs():
         "m4a": ["aac"]
     }
     
-    try:
-        # Query FFmpeg for available encoders
-        result = subprocess.run(
-            ['ffmpeg', '-encoders'],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            check=True,
-            timeout=2
-        )
-        
-        output = result.stdout.decode('utf-8')
-        
+    encoders = probe_ffmpeg_encoders()
+    if encoders:
         # Check for additional codecs
-        if "pcm_s24le" in output:
+        if "pcm_s24le" in encoders:
             codecs["wav"].append("pcm_s24le (24-bit)")
-        if "pcm_f32le" in output:
+        if "pcm_f32le" in encoders:
             codecs["wav"].append("pcm_f32le (32-bit float)")
-        if "pcm_alaw" in output or "alaw" in output:
+        if "pcm_alaw" in encoders:
             codecs["wav"].append("alaw (8-bit A-law)")
-        if "pcm_mulaw" in output or "mulaw" in output:
+        if "pcm_mulaw" in encoders:
             codecs["wav"].append("mulaw (8-bit μ-law)")
-        if "libopus" in output:
+        if "libopus" in encoders:
             codecs["ogg"].append("libopus")
-            
-    except Exception as e:
-        print(f"Warning: Unable to query FFmpeg for codecs: {e}")
+    else:
         # Use default codecs list if FFmpeg query fails
         codecs["wav"] = [
             "pcm_s16le (16-bit)", 
@@ -180,6 +278,64 @@ def get_available_codecs():
         
     return codecs
 
+def prefetch_file(file_path):
+    """
+    Ask the OS to start reading a file into the page cache in the background
+    
+    Used for files that are about to be read in full, so the disk reads
+    overlap with other work. Does nothing where posix_fadvise isn't available.
+    
+    Args:
+        file_path: Path to the file
+    """
+    if not hasattr(os, 'posix_fadvise'):
+        return
+    try:
+        fd = os.open(file_path, os.O_RDONLY)
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+        finally:
+            os.close(fd)
+    except OSError:
+        pass
+
+# Read size for hashing on Pythons without hashlib.file_digest
+HASH_READ_SIZE = 1 << 20
+
+# Files up to this size are hashed through a memory map in a single update
+# call; larger ones (or any file on 32-bit builds) are streamed instead
+HASH_MMAP_MAX_SIZE = (1 << 31) if sys.maxsize > 2**32 else 0
+
+def hash_file(file_path, hash_type='sha256'):
+    """
+    Hash a file, raising OSError if it cannot be read
+    
+    Args:
+        file_path: Path to the file
+        hash_type: Type of hash (md5, sha1, sha256)
+        
+    Returns:
+        str: Hash value as hexadecimal string
+    """
+    hash_name = hash_type.lower()
+    if hash_name not in ('md5', 'sha1'):
+        hash_name = 'sha256'  # Default to sha256
+        
+    with open(file_path, 'rb') as f:
+        if 0 < os.fstat(f.fileno()).st_size <= HASH_MMAP_MAX_SIZE:
+            # Hand the whole mapping to OpenSSL at once: no read copies
+            hash_obj = hashlib.new(hash_name)
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                hash_obj.update(mapped)
+            return hash_obj.hexdigest()
+        if hasattr(hashlib, 'file_digest'):
+            # Python 3.11+: the read loop runs in C with a large buffer
+            return hashlib.file_digest(f, hash_name).hexdigest()
+        hash_obj = hashlib.new(hash_name)
+        for chunk in iter(lambda: f.read(HASH_READ_SIZE), b''):
+            hash_obj.update(chunk)
+        return hash_obj.hexdigest()
+
 def calculate_file_hash(file_path, hash_type='sha256'):
     """
     Calculate hash of a file
@@ -195,23 +351,45 @@ def calculate_file_hash(file_path, hash_type='sha256'):
         return "File not found"
         
     try:
-        hash_obj = None
-        if hash_type.lower() == 'md5':
-            hash_obj = hashlib.md5()
-        elif hash_type.lower() == 'sha1':
-            hash_obj = hashlib.sha1()
-        else:  # Default to sha256
-            hash_obj = hashlib.sha256()
-            
-        with open(file_path, 'rb') as f:
-            # Read file in chunks of 4K
-            for chunk in iter(lambda: f.read(4096), b''):
-                hash_obj.update(chunk)
-                
-        return hash_obj.hexdigest()
+        return hash_file(file_path, hash_type)
     except Exception as e:
         return f"Error calculating hash: {str(e)}"
 
+# Layout of the recording log; fields are filled by create_recording_log
+# and update_recording_log
+RECORDING_LOG_TEMPLATE = """
+KVSrecorder v{app_version} - RECORDING LOG
+==================================
+
+File Information:
+----------------
+Filename: {filename}
+File Path: {audio_file_path}
+File Size: {file_size}
+File Hash (SHA-256): {file_hash}
+
+Recording Session:
+----------------
+Start Time: {start_time_str}
+End Time: {end_time_str}
+Duration: {duration_str}
+
+FFmpeg Command:
+----------------
+{ffmpeg_command_str}
+
+System Information:
+----------------
+Platform: {platform}
+Python Version: {python_version}
+Software Version: {app_version}
+Log Created: {log_created}
+"""
+
+def _format_log_time(timestamp):
+    """Format a datetime for the log, truncated to milliseconds"""
+    return timestamp.strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+
 def create_recording_log(log_file_path, audio_file_path, ffmpeg_command, start_time, end_time=None):
     """
     Create a log file for a recording session
@@ -224,7 +402,8 @@ def create_recording_log(log_file_path, audio_file_path, ffmpeg_command, start_t
         end_time: Recording end time (datetime object), or None if recording is in progress
     
     Returns:
-        bool: True if log was created successfully
+        dict: The log's fields, to pass to update_recording_log, or None if
+              the log could not be created
     """
     try:
         # Create log directory if it doesn't exist
@@ -232,34 +411,17 @@ def create_recording_log(log_file_path, audio_file_path, ffmpeg_command, start_t
         if log_dir and not os.path.exists(log_dir):
             os.makedirs(log_dir)
             
-        # Format times with microseconds
-        start_time_str = start_time.strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]  # Truncate to milliseconds
-        end_time_str = end_time.strftime("%Y-%m-%d %H:%M:%S.%f")[:-3] if end_time else "In Progress"
-        
         # Calculate duration
         duration_str = "In Progress"
         if end_time:
-            duration = end_time - start_time
-            total_seconds = duration.total_seconds()
-            # Format duration as 00:00:00.000
-            hours = int(total_seconds // 3600)
-            minutes = int((total_seconds % 3600) // 60)
-            seconds = int(total_seconds % 60)
-            milliseconds = int((total_seconds - int(total_seconds)) * 1000)
-            duration_str = f"{hours:02d}:{minutes:02d}:{seconds:02d}.{milliseconds:03d}"
+            duration_str = _format_hms_ms((end_time - start_time).total_seconds())
             
         # Calculate file hash if the file exists
         file_hash = "File not found"
-        file_size_kb = "N/A"
+        file_size = "N/A"
         if os.path.exists(audio_file_path):
             file_hash = calculate_file_hash(audio_file_path)
-            file_size_bytes = os.path.getsize(audio_file_path)
-            if file_size_bytes < 1024:
-                file_size_kb = f"{file_size_bytes} B"
-            elif file_size_bytes < 1024 * 1024:
-                file_size_kb = f"{file_size_bytes / 1024:.2f} KB"
-            else:
-                file_size_kb = f"{file_size_bytes / (1024 * 1024):.2f} MB"
+            file_size = format_file_size(os.path.getsize(audio_file_path))
             
         # Format command as string if it's a list
         if isinstance(ffmpeg_command, list):
@@ -267,51 +429,40 @@ def create_recording_log(log_file_path, audio_file_path, ffmpeg_command, start_t
         else:
             ffmpeg_command_str = str(ffmpeg_command)
             
-        # Create log content
-        log_content = f"""
-KVSrecorder v{APP_VERSION} - RECORDING LOG
-==================================
-
-File Information:
-----------------
-Filename: {os.path.basename(audio_file_path)}
-File Path: {audio_file_path}
-File Size: {file_size_kb}
-File Hash (SHA-256): {file_hash}
-
-Recording Session:
-----------------
-Start Time: {start_time_str}
-End Time: {end_time_str}
-Duration: {duration_str}
-
-FFmpeg Command:
-----------------
-{ffmpeg_command_str}
-
-System Information:
-----------------
-Platform: {sys.platform}
-Python Version: {sys.version}
-Software Version: {APP_VERSION}
-Log Created: {datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]}
-"""
+        fields = {
+            "app_version": APP_VERSION,
+            "filename": os.path.basename(audio_file_path),
+            "audio_file_path": audio_file_path,
+            "file_size": file_size,
+            "file_hash": file_hash,
+            "start_time": start_time,
+            "start_time_str": _format_log_time(start_time),
+            "end_time_str": _format_log_time(end_time) if end_time else "In Progress",
+            "duration_str": duration_str,
+            "ffmpeg_command_str": ffmpeg_command_str,
+            "platform": sys.platform,
+            "python_version": sys.version,
+            "log_created": _format_log_time(datetime.datetime.now()),
+        }
         
         # Write to log file
         with open(log_file_path, 'w') as f:
-            f.write(log_content)
+            f.write(RECORDING_LOG_TEMPLATE.format(**fields))
             
-        return True
+        return fields
     except Exception as e:
         print(f"Error creating recording log: {e}")
-        return False
+        return None
 
-def update_recording_log(log_file_path, end_time=None, file_hash=None):
+def update_recording_log(log_file_path, log_fields, end_time=None, file_hash=None):
     """
-    Update an existing recording log with end time and file hash
+    Update a log created by create_recording_log with end time and file hash
+    
+    The log is re-rendered from its fields instead of being read back.
     
     Args:
         log_file_path: Path to the log file
+        log_fields: Fields returned by create_recording_log (updated in place)
         end_time: Recording end time (datetime object)
         file_hash: Hash value of the file
         
@@ -319,80 +470,28 @@ def update_recording_log(log_file_path, end_time=None, file_hash=None):
         bool: True if log was updated successfully
     """
     try:
-        if not os.path.exists(log_file_path):
+        fields = log_fields
+        if fields is None:
             return False
             
-        # Read existing log
-        with open(log_file_path, 'r') as f:
-            log_content = f.read()
-            
-        # Update end time
+        # Update end time, duration and the final file size
         if end_time:
-            end_time_str = end_time.strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]  # Truncate to milliseconds
-            log_content = log_content.replace("End Time: In Progress", f"End Time: {end_time_str}")
+            fields["end_time_str"] = _format_log_time(end_time)
+            fields["duration_str"] = _format_hms_ms((end_time - fields["start_time"]).total_seconds())
             
-            # Calculate and update duration
-            start_time_str = None
-            for line in log_content.split('\n'):
-                if line.startswith("Start Time:"):
-                    start_time_str = line.replace("Start Time: ", "").strip()
-                    break
-                    
-            if start_time_str:
-                try:
-                    start_time = datetime.datetime.strptime(start_time_str, "%Y-%m-%d %H:%M:%S.%f")
-                except ValueError:
-                    try:
-                        # Try without milliseconds if parse fails
-                        start_time = datetime.datetime.strptime(start_time_str, "%Y-%m-%d %H:%M:%S")
-                    except:
-                        start_time = None
-                        
-                if start_time:
-                    duration = end_time - start_time
-                    total_seconds = duration.total_seconds()
-                    # Format duration as 00:00:00.000
-                    hours = int(total_seconds // 3600)
-                    minutes = int((total_seconds % 3600) // 60)
-                    seconds = int(total_seconds % 60)
-                    milliseconds = int((total_seconds - int(total_seconds)) * 1000)
-                    duration_str = f"{hours:02d}:{minutes:02d}:{seconds:02d}.{milliseconds:03d}"
-                    log_content = log_content.replace("Duration: In Progress", f"Duration: {duration_str}")
-                    
-            # Also update file size if file path can be found
-            file_path = None
-            for line in log_content.split('\n'):
-                if line.startswith("File Path:"):
-                    file_path = line.replace("File Path: ", "").strip()
-                    break
-                    
-            if file_path and os.path.exists(file_path):
-                file_size_bytes = os.path.getsize(file_path)
-                if file_size_bytes < 1024:
-                    file_size_str = f"{file_size_bytes} B"
-                elif file_size_bytes < 1024 * 1024:
-                    file_size_str = f"{file_size_bytes / 1024:.2f} KB"
-                else:
-                    file_size_str = f"{file_size_bytes / (1024 * 1024):.2f} MB"
-                    
-                # Replace file size line (handle both N/A and actual values)
-                if "File Size: N/A" in log_content:
-                    log_content = log_content.replace("File Size: N/A", f"File Size: {file_size_str}")
-                else:
-                    # Try to find and replace existing file size
-                    import re
-                    file_size_pattern = r"File Size: .*$"
-                    log_content = re.sub(file_size_pattern, f"File Size: {file_size_str}", log_content, flags=re.MULTILINE)
+            file_path = fields["audio_file_path"]
+            if os.path.exists(file_path):
+                fields["file_size"] = format_file_size(os.path.getsize(file_path))
         
         # Update file hash
         if file_hash:
-            log_content = log_content.replace("File Hash (SHA-256): File not found", f"File Hash (SHA-256): {file_hash}")
+            fields["file_hash"] = file_hash
             
         # Write updated log
         with open(log_file_path, 'w') as f:
-            f.write(log_content)
+            f.write(RECORDING_LOG_TEMPLATE.format(**fields))
             
         return True
     except Exception as e:
         print(f"Error updating recording log: {e}")
-        return False
\ No newline at end of file
+        return False
@@ -0,0 +1,98 @@
+"""
+Waveform Renderer Module
+
+Draws the live waveform into an image on a worker thread, so the GUI thread
+only has to display the finished image.
+"""
+
+import numpy as np
+from PyQt6 import QtGui
+from PyQt6.QtCore import QObject, QRunnable, pyqtSignal
+from utils import downsample_minmax
+
+class WaveformRenderSignals(QObject):
+    """
+    Signals for WaveformRenderTask (a QRunnable cannot emit signals itself).
+    Emits the rendered waveform image, or the error if drawing failed.
+    """
+    image_ready = pyqtSignal(QtGui.QImage)
+    render_failed = pyqtSignal(str)
+
+class WaveformBuffers:
+    """
+    Image and polyline storage reused from one waveform render to the next.
+    Only one render may use the buffers at a time.
+    
+    Two images are used in turn: the window keeps the last emitted image
+    (waveform_image) for painting, and that copy shares the image's data,
+    so drawing into the same image again would make Qt detach and copy it.
+    """
+    def __init__(self):
+        self.images = [QtGui.QImage(), QtGui.QImage()]
+        self.image = self.images[0]
+        self.polyline = QtGui.QPolygonF()
+        self.points = np.empty((0, 2))  # NumPy view of the polyline's (x, y) pairs
+
+    def prepare(self, width, height, n_points):
+        """Switch to the other image and (re)allocate buffers whose size changed"""
+        self.images.reverse()
+        if self.images[0].width() != width or self.images[0].height() != height:
+            self.images[0] = QtGui.QImage(width, height, QtGui.QImage.Format.Format_RGB32)
+        self.image = self.images[0]
+        if self.polyline.size() != n_points:
+            self.polyline.resize(n_points)
+            # QPointF is two doubles, so the point array can be filled in place
+            pointer = self.polyline.data()
+            pointer.setsize(n_points * 2 * 8)
+            self.points = np.frombuffer(pointer, dtype=np.float64).reshape(n_points, 2)
+
+class WaveformRenderTask(QRunnable):
+    """
+    Task for drawing one waveform snapshot into a QImage.
+    QImage (unlike QPixmap) can be painted outside the GUI thread.
+    """
+    # Vertical padding (pixels) above and below the waveform
+    MARGIN = 8
+
+    def __init__(self, signals, buffers, audio_data, peak, width, height, pen):
+        super().__init__()
+        self.signals = signals
+        self.buffers = buffers
+        self.audio_data = audio_data
+        self.peak = peak
+        self.width = width
+        self.height = height
+        self.pen = pen
+
+    def run(self):
+        """Draw the waveform and emit the finished image (or the error)"""
+        # An exception escaping QRunnable.run aborts the application, so every
+        # error is caught and reported through render_failed instead
+        try:
+            # Only plot the min/max envelope of each pixel column
+            positions, values = downsample_minmax(self.audio_data, self.width)
+
+            buffers = self.buffers
+            buffers.prepare(self.width, self.height, values.size)
+            buffers.image.fill(QtGui.QColor('#ffffff'))
+
+            # Scale the chunk peak to the image height, like an autoscaled plot,
+            # writing the coordinates straight into the polyline
+            mid = self.height / 2
+            scale = (mid - self.MARGIN) / max(self.peak, 1.0)
+            np.multiply(positions, (self.width - 1) / max(len(self.audio_data) - 1, 1), out=buffers.points[:, 0])
+            np.multiply(values, -scale, out=buffers.points[:, 1])
+            buffers.points[:, 1] += mid
+
+            painter = QtGui.QPainter(buffers.image)
+            try:
+                painter.setRenderHint(QtGui.QPainter.RenderHint.Antialiasing)
+                painter.setPen(self.pen)
+                painter.drawPolyline(buffers.polyline)
+            finally:
+                painter.end()
+        except Exception as e:
+            self.signals.render_failed.emit(str(e))
+            return
+
+        self.signals.image_ready.emit(buffers.image)